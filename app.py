@@ -1,5 +1,7 @@
 import os
+from typing import Dict, Any
 
+from flask import Flask
 from waitress import serve # type: ignore
 from dotenv import load_dotenv # type: ignore
 
@@ -12,8 +14,12 @@ PRODUCTION_PORT = 5001
 HOST = "0.0.0.0"
 DEVELOPMENT = "development"
 PRODUCTION = "production"
+WAITRESS_THREADS = int(os.getenv('WAITRESS_THREADS', '16'))
+WAITRESS_CHANNEL_TIMEOUT = 120
+WAITRESS_CONNECTION_LIMIT = 2000
 
-if __name__ == '__main__':
+
+def build_config() -> Dict[str, Any]:
     required_env_vars = ['DATABASE_HOST', 'DATABASE_NAME', 'DATABASE_USER', 'DATABASE_PASSWORD']
     missing_vars = [var for var in required_env_vars if not os.environ.get(var)]
     
@@ -23,34 +29,79 @@ if __name__ == '__main__':
             f"Please check your .env file."
         )
     
-    flask_env = os.getenv('FLASK_ENV', DEVELOPMENT).lower()
-    
     db_user = os.getenv('DATABASE_USER')
     db_password = os.getenv('DATABASE_PASSWORD')
     db_host = os.getenv('DATABASE_HOST')
     db_name = os.getenv('DATABASE_NAME')
+    replica_hosts = [host.strip() for host in os.getenv('DATABASE_REPLICA_HOSTS', '').split(',') if host.strip()]
     
-    config = {
+    return {
         'DEBUG': os.getenv('DEBUG', 'False').lower() == 'true',
         'SQLALCHEMY_DATABASE_URI': f'mysql://{db_user}:{db_password}@{db_host}/{db_name}',
-        'SQLALCHEMY_TRACK_MODIFICATIONS': os.getenv('SQLALCHEMY_TRACK_MODIFICATIONS', 'False').lower() == 'true'
+        'SQLALCHEMY_REPLICA_URIS': [f'mysql://{db_user}:{db_password}@{host}/{db_name}' for host in replica_hosts],
+        'DB_REPLICA_MAX_LAG': float(os.getenv('DB_REPLICA_MAX_LAG', '5')),
+        'DB_REPLICA_CHECK_INTERVAL': float(os.getenv('DB_REPLICA_CHECK_INTERVAL', '5')),
+        'SQLALCHEMY_TRACK_MODIFICATIONS': os.getenv('SQLALCHEMY_TRACK_MODIFICATIONS', 'False').lower() == 'true',
+        'ENTITY_CACHE_ENABLED': os.getenv('ENTITY_CACHE_ENABLED', 'True').lower() == 'true',
+        'ENTITY_CACHE_MAX_SIZE': int(os.getenv('ENTITY_CACHE_MAX_SIZE', '10000')),
+        'ENTITY_CACHE_TTL': float(os.getenv('ENTITY_CACHE_TTL', '30')),
+        'PROCEDURE_CACHE_ENABLED': os.getenv('PROCEDURE_CACHE_ENABLED', 'True').lower() == 'true',
+        'PROCEDURE_CACHE_MAX_SIZE': int(os.getenv('PROCEDURE_CACHE_MAX_SIZE', '1000')),
+        'PROCEDURE_CACHE_TTL': float(os.getenv('PROCEDURE_CACHE_TTL', '300')),
+        'DB_AUTO_MIGRATE': os.getenv('DB_AUTO_MIGRATE', 'False').lower() == 'true',
+        'USE_STORED_PROCEDURES': os.getenv('USE_STORED_PROCEDURES', 'False').lower() == 'true',
+        'PRODUCTION_MAX_POINTS': int(os.getenv('PRODUCTION_MAX_POINTS', '1000')),
+        'COMPRESSION_ENABLED': os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true',
+        'COMPRESSION_MIN_SIZE': int(os.getenv('COMPRESSION_MIN_SIZE', '1024')),
+        'COMPRESSION_GZIP_LEVEL': int(os.getenv('COMPRESSION_GZIP_LEVEL', '6')),
+        'COMPRESSION_BROTLI_QUALITY': int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4')),
+        'SWAGGER_ENABLED': os.getenv('SWAGGER_ENABLED', 'True').lower() == 'true',
+        'SWAGGER_SPEC_FILE': os.getenv('SWAGGER_SPEC_FILE'),
+        'JSON_PROVIDER': os.getenv('JSON_PROVIDER', 'iso').lower(),
+        'WAITRESS_THREADS': WAITRESS_THREADS,
+        'DB_POOL_SIZE': os.getenv('DB_POOL_SIZE'),
+        'DB_MAX_OVERFLOW': os.getenv('DB_MAX_OVERFLOW'),
+        'DB_POOL_TIMEOUT': os.getenv('DB_POOL_TIMEOUT'),
+        'DB_POOL_RECYCLE': os.getenv('DB_POOL_RECYCLE'),
+        'DB_POOL_PRE_PING': os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true',
     }
 
+
+def serve_production(app: Flask, host: str = HOST, port: int = PRODUCTION_PORT,
+                     threads: int = WAITRESS_THREADS) -> None:
+    """
+    Runs `app` under waitress with the production settings (also what benchmarks/load_test.py drives).
+    """
+    serve(
+        app,
+        host=host,
+        port=port,
+        threads=threads,
+        channel_timeout=WAITRESS_CHANNEL_TIMEOUT,
+        connection_limit=WAITRESS_CONNECTION_LIMIT,
+        asyncore_use_poll=True,  # poll/select
+        url_scheme='http'
+    )
+
+
+def make_app() -> Flask:
+    """
+    App factory for the flask CLI, e.g. `flask --app "app:make_app()" migrate`.
+    Skips the schema version check, so that `migrate` can run against a database that needs it.
+    """
+    return create_app({**build_config(), 'DB_CHECK_SCHEMA': False})
+
+
+if __name__ == '__main__':
+    flask_env = os.getenv('FLASK_ENV', DEVELOPMENT).lower()
+    config = build_config()
+
     if flask_env == DEVELOPMENT:
         config['DEBUG'] = True
         create_app(config).run(host=HOST, port=DEVELOPMENT_PORT, debug=True)
 
     elif flask_env == PRODUCTION:
-        serve(
-            create_app(config), 
-            host=HOST, 
-            port=PRODUCTION_PORT,
-            threads=16,
-            channel_timeout=120,
-            connection_limit=2000,
-            asyncore_use_poll=True,  # poll/select
-            url_scheme='http'
-        )
+        serve_production(create_app(config))
 
     else:
         raise ValueError(f"Invalid FLASK_ENV value: '{flask_env}'. Must be 'development' or 'production'.")
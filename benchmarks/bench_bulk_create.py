@@ -0,0 +1,41 @@
+"""
+Rows/second of `POST /panel-productions` one reading at a time versus `POST /panel-productions/bulk`.
+
+    python -m benchmarks.bench_bulk_create --rows 5000 [--batch 500] [--database-uri mysql://...]
+"""
+import time
+
+from benchmarks.support import argument_parser, make_app, seed_reference_rows, reading_time
+
+
+def readings(start: int, count: int):
+    return [{'date_time': reading_time(i), 'production': 1.5, 'solar_panel_id': 1} for i in range(start, start + count)]
+
+
+def main() -> None:
+    parser = argument_parser(__doc__)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--batch', type=int, default=500)
+    args = parser.parse_args()
+
+    app = make_app(args.database_uri)
+    seed_reference_rows(app)
+    client = app.test_client()
+
+    started = time.perf_counter()
+    for reading in readings(0, args.rows):
+        assert client.post('/panel-productions', json=reading).status_code == 201
+    single = args.rows / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for offset in range(0, args.rows, args.batch):
+        batch = readings(args.rows + offset, min(args.batch, args.rows - offset))
+        assert client.post('/panel-productions/bulk', json=batch).status_code == 201
+    bulk = args.rows / (time.perf_counter() - started)
+
+    print(f"one at a time: {single:10.0f} rows/s")
+    print(f"bulk ({args.batch}/call): {bulk:10.0f} rows/s  x{bulk / single:.1f}")
+
+
+if __name__ == '__main__':
+    main()
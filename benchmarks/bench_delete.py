@@ -0,0 +1,57 @@
+"""
+Deletes/second and statements per delete of GeneralDAO.delete versus the previous
+find_by_id + query.get + session.delete path, on battery_level rows.
+
+    python -m benchmarks.bench_delete --rows 5000 [--database-uri mysql://...]
+"""
+import time
+
+from sqlalchemy import event
+
+from my_project import db
+from my_project.auth.dao import battery_level_dao
+from my_project.auth.domain import BatteryLevel
+from benchmarks.support import argument_parser, make_app, seed_reference_rows, reading_time
+
+
+def legacy_delete(key: int) -> None:
+    if db.session.query(BatteryLevel).get(key) is None:
+        raise LookupError(key)
+    domain_obj = db.session.query(BatteryLevel).get(key)
+    db.session.delete(domain_obj)
+    db.session.commit()
+
+
+def timed(delete, keys, statements):
+    statements.clear()
+    started = time.perf_counter()
+    for key in keys:
+        delete(key)
+    return len(keys) / (time.perf_counter() - started), len(statements) / len(keys)
+
+
+def main() -> None:
+    parser = argument_parser(__doc__)
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    app = make_app(args.database_uri)
+    seed_reference_rows(app)
+    client = app.test_client()
+    levels = [{'date_time': reading_time(i), 'charge_level': 50.0, 'battery_id': 1} for i in range(2 * args.rows)]
+    assert client.post('/battery-levels/bulk?return_ids=true', json=levels).status_code == 201
+
+    with app.app_context():
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *_: statements.append(1))
+        ids = [row.id for row in db.session.query(BatteryLevel.id).order_by(BatteryLevel.id)]
+        db.session.commit()
+        legacy_rate, legacy_statements = timed(legacy_delete, ids[:args.rows], statements)
+        direct_rate, direct_statements = timed(battery_level_dao.delete, ids[args.rows:], statements)
+
+    print(f"find + ORM delete: {legacy_rate:10.0f} deletes/s  {legacy_statements:.1f} statements/delete")
+    print(f"direct DELETE:     {direct_rate:10.0f} deletes/s  {direct_statements:.1f} statements/delete")
+
+
+if __name__ == '__main__':
+    main()
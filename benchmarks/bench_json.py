@@ -0,0 +1,58 @@
+"""
+Serialization throughput of a list of BatteryLevel DTOs (as `GET /battery-levels` returns it)
+with Flask's default provider, IsoJSONProvider on the stdlib json module, and IsoJSONProvider on orjson.
+
+    python -m benchmarks.bench_json --rows 100000 [--repeat 5]
+"""
+import time
+from datetime import datetime, timedelta
+
+from flask.json.provider import DefaultJSONProvider
+
+from my_project.auth.domain import BatteryLevel
+from my_project.json_provider import IsoJSONProvider, orjson
+from benchmarks.support import argument_parser, make_app
+
+
+def battery_level_dtos(rows: int):
+    start = datetime(2023, 1, 1)
+    return [
+        BatteryLevel(id=i + 1, date_time=start + timedelta(minutes=5 * i), charge_level=50.0 + i % 50,
+                     battery_id=1 + i % 10).put_into_dto()
+        for i in range(rows)
+    ]
+
+
+def timed(provider, dtos, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = provider.response(dtos).get_data()
+        best = min(best, time.perf_counter() - started)
+    return len(dtos) / best, len(body)
+
+
+def main() -> None:
+    parser = argument_parser(__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app(args.database_uri)
+    dtos = battery_level_dtos(args.rows)
+    stdlib_provider = IsoJSONProvider(app)
+    stdlib_provider.use_orjson = False
+    providers = [('flask default (RFC 822 dates)', DefaultJSONProvider(app)), ('iso, stdlib json', stdlib_provider)]
+    if orjson is not None:
+        providers.append(('iso, orjson', IsoJSONProvider(app)))
+    else:
+        print("orjson is not installed, skipping it")
+
+    with app.app_context():
+        for name, provider in providers:
+            rate, size = timed(provider, dtos, args.repeat)
+            print(f"{name:32} {rate:12.0f} rows/s  {size / 2 ** 20:6.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
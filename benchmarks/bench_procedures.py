@@ -0,0 +1,78 @@
+"""
+Requests/second of the `get-*-after-*` routes answered by the Core queries versus the stored procedures
+(USE_STORED_PROCEDURES), for the whole result and for 100-row pages, with the procedure cache off.
+The procedures only exist on MySQL; on other databases only the Core queries are timed.
+
+    python -m benchmarks.bench_procedures --rows 5000 [--repeat 20] [--database-uri mysql://...]
+"""
+import time
+from datetime import date
+
+from my_project import db
+from my_project.auth.domain import Owner, OwnerHasStation, SolarPanel, Battery
+from benchmarks.support import argument_parser, make_app, seed_reference_rows
+
+ROUTES = [
+    '/solar-panels/get-solar-panels-after-panel-type/1',
+    '/solar-panels/get-solar-panels-after-station/1',
+    '/batteries/get-batteries-after-station/1',
+    '/owner-has-stations/get-owners-after-station/1',
+    '/owner-has-stations/get-stations-after-owner/1',
+]
+
+
+def seed_related_rows(app, rows: int) -> None:
+    """
+    Attaches `rows` solar panels, batteries and owners to station 1 (panel type 1), and `rows` station links
+    to owner 1.
+    """
+    with app.app_context():
+        db.session.add_all([Owner(name='Owner', surname=str(i), contact_number=380000000) for i in range(rows)])
+        db.session.flush()
+        db.session.add_all(
+            [SolarPanel(installation_date=date(2022, 1, 20), panel_type_id=1, station_id=1) for _ in range(rows)]
+            + [Battery(capacity='100 kWh', installation_date=date(2022, 1, 25), station_id=1) for _ in range(rows)]
+            + [OwnerHasStation(owner_id=1 + i, station_id=1, ownership_percentage=1.0) for i in range(rows)]
+            + [OwnerHasStation(owner_id=1, station_id=1, ownership_percentage=1.0) for _ in range(rows)]
+        )
+        db.session.commit()
+
+
+def timed(client, url: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        best = min(best, time.perf_counter() - started)
+        assert response.status_code == 200, (url, response.status_code)
+    return 1 / best
+
+
+def main() -> None:
+    parser = argument_parser(__doc__)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    modes = [('core', False)]
+    if args.database_uri.startswith('mysql'):
+        modes.append(('procedure', True))
+    else:
+        print("stored procedures need MySQL, timing the Core queries only")
+
+    for name, use_procedures in modes:
+        app = make_app(args.database_uri, PROCEDURE_CACHE_ENABLED=False, USE_STORED_PROCEDURES=use_procedures)
+        if name == modes[0][0]:
+            seed_reference_rows(app)
+            seed_related_rows(app, args.rows)
+        client = app.test_client()
+        for route in ROUTES:
+            print(f"{name:9} {route:50} all: {timed(client, route, args.repeat):8.1f} req/s", end='')
+            if use_procedures:
+                print()
+            else:
+                print(f"  page of 100: {timed(client, route + '?limit=100', args.repeat):8.1f} req/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Per-route latency, queries per request and peak allocations for every API route (all CRUD routes of every
+blueprint, the get-*-after-* and calculate-energy-sold routes, _mget, bulk and stats), against a database
+seeded from data.sql scaled up `--scale` times. Routes that fail on the database (e.g. the CALLs behind
+POST /locations on SQLite) are listed with their status instead of timings.
+
+    python -m benchmarks.bench_routes [--scale 50] [--iterations 100] [--filter solar] [--json report.json]
+"""
+import json
+import logging
+import statistics
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import event
+from werkzeug.routing import Rule
+
+from my_project import db
+from benchmarks.support import argument_parser, make_app, seed_from_data_sql
+
+BULK_ROWS = 100
+MGET_IDS = 100
+SKIPPED_BLUEPRINTS = ('flasgger',)
+PATH_VALUES = {'type': 'monthly'}
+
+
+class RouteCase:
+    """
+    One method of one URL rule with the request that exercises it: seeded ids in the path and, for writes,
+    a body derived from an existing row, so the route returns 2xx without changing the seeded data's shape.
+    """
+
+    def __init__(self, client: FlaskClient, rule: Rule, method: str, rows_per_table: int) -> None:
+        self.client = client
+        self.rule = rule
+        self.method = method
+        self.name = f"{method} {rule.rule}"
+        self.collection = '/' + rule.rule.split('/')[1]
+        self.rows_per_table = rows_per_table
+        self._dto: Dict[str, Any] = {}
+        self._delete_ids: List[int] = []
+
+    def prepare(self, iterations: int) -> None:
+        if self.method == 'GET':
+            return
+        self._dto = self.client.get(f"{self.collection}/1").get_json() or {}
+        self._dto.pop('id', None)
+        # DELETE removes fresh rows (nothing references them), created through the bulk route
+        if self.method == 'DELETE':
+            response = self.client.post(f"{self.collection}/bulk?return_ids=true", json=[self._dto] * iterations)
+            self._delete_ids = response.get_json()['ids'] if response.status_code == 201 else []
+
+    def request(self, i: int):
+        if self.method == 'DELETE':
+            key = self._delete_ids[i] if i < len(self._delete_ids) else 0
+            return self.client.delete(self._path(key))
+        if self.method == 'GET':
+            return self.client.get(self._path(1 + i % self.rows_per_table))
+        if self.rule.rule.endswith('/_mget'):
+            return self.client.post(self.rule.rule, json={'ids': list(range(1, MGET_IDS + 1))})
+        if self.rule.rule.endswith('/bulk'):
+            return self.client.post(self.rule.rule, json=[self._dto] * BULK_ROWS)
+        if self.method == 'POST':
+            return self.client.post(self.rule.rule, json=self._dto)
+        # PUT and PATCH write back the row's own values
+        dto = self._dto
+        if self.method == 'PATCH':
+            name = next(name for name in dto if not name.endswith('_id'))
+            dto = {name: dto[name]}
+        return self.client.open(self._path(1), method=self.method, json=dto)
+
+    def _path(self, key: int) -> str:
+        values = {name: PATH_VALUES.get(name, key) for name in self.rule.arguments}
+        return self.rule.build(values, append_unknown=False)[1]
+
+
+def route_cases(app: Flask, client: FlaskClient, rows_per_table: int, name_filter: Optional[str]) -> List[RouteCase]:
+    cases = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+        if rule.endpoint == 'static' or rule.endpoint.split('.')[0] in SKIPPED_BLUEPRINTS:
+            continue
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            case = RouteCase(client, rule, method, rows_per_table)
+            if name_filter is None or name_filter in case.name:
+                cases.append(case)
+    return cases
+
+
+def measure(case: RouteCase, iterations: int, warmup: int, statements: List[Any]) -> Dict[str, Any]:
+    case.prepare(warmup + 2 * iterations)
+    status = case.request(0).status_code
+    if status >= 400:
+        return {'route': case.name, 'status': status}
+    for i in range(1, warmup):
+        case.request(i)
+
+    durations = []
+    errors = 0
+    statements.clear()
+    for i in range(warmup, warmup + iterations):
+        started = time.perf_counter()
+        response = case.request(i)
+        durations.append(time.perf_counter() - started)
+        errors += response.status_code >= 400
+    queries = len(statements) / iterations
+
+    # a separate pass, tracemalloc slows every allocation down
+    peaks = []
+    tracemalloc.start()
+    for i in range(warmup + iterations, warmup + 2 * iterations):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        case.request(i)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    durations.sort()
+    return {
+        'route': case.name,
+        'status': status,
+        'median_ms': 1000 * statistics.median(durations),
+        'p95_ms': 1000 * durations[int(0.95 * (len(durations) - 1))],
+        'queries': queries,
+        'peak_kib': statistics.median(peaks) / 1024,
+        'errors': errors,
+    }
+
+
+def main() -> None:
+    parser = argument_parser(__doc__)
+    parser.add_argument('--scale', type=int, default=50, help='Copies of the data.sql rows to load')
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--filter', help='Only routes whose "METHOD /rule" contains this')
+    parser.add_argument('--json', help='Also write the results to this file')
+    args = parser.parse_args()
+
+    app = make_app(args.database_uri)
+    app.logger.setLevel(logging.CRITICAL)  # failing routes are reported in the table
+    sizes = seed_from_data_sql(app, args.scale)
+    client = app.test_client()
+
+    statements: List[Any] = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *_: statements.append(1))
+    rows_per_table = min(sizes.values())
+
+    results = []
+    print(f"{'route':72} {'median ms':>10} {'p95 ms':>8} {'queries':>8} {'peak KiB':>9} {'errors':>6}")
+    for case in route_cases(app, client, rows_per_table, args.filter):
+        result = measure(case, args.iterations, args.warmup, statements)
+        results.append(result)
+        if 'median_ms' in result:
+            print(f"{result['route']:72} {result['median_ms']:10.2f} {result['p95_ms']:8.2f} "
+                  f"{result['queries']:8.1f} {result['peak_kib']:9.1f} {result['errors']:6}")
+        else:
+            print(f"{result['route']:72} failed with HTTP {result['status']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':')[0], 'scale': args.scale,
+                       'rows': sizes, 'iterations': args.iterations, 'routes': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
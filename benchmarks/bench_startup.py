@@ -0,0 +1,62 @@
+"""
+create_app time and statements per start: the previous unconditional database_exists + create_all,
+DB_AUTO_MIGRATE against an up-to-date schema, and the default schema_version check.
+An in-memory SQLite database would be fresh on every start, so the default is a temporary SQLite file.
+
+    python -m benchmarks.bench_startup [--starts 20] [--database-uri mysql://...]
+"""
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy_utils import database_exists, create_database
+
+from my_project import db
+from benchmarks.support import argument_parser, make_app
+
+
+def legacy_start(database_uri: str) -> None:
+    app = make_app(database_uri, DB_AUTO_MIGRATE=False, DB_CHECK_SCHEMA=False)
+    if not database_exists(database_uri):
+        create_database(database_uri)
+    with app.app_context():
+        db.create_all()
+
+
+def timed(start, starts: int, statements) -> tuple:
+    durations = []
+    statements.clear()
+    for _ in range(starts):
+        started = time.perf_counter()
+        start()
+        durations.append(time.perf_counter() - started)
+    return 1000 * statistics.median(durations), len(statements) / starts
+
+
+def main() -> None:
+    parser = argument_parser(__doc__)
+    parser.add_argument('--starts', type=int, default=20)
+    args = parser.parse_args()
+
+    database_uri = args.database_uri
+    if database_uri == 'sqlite://':
+        database_uri = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'startup.db')
+    make_app(database_uri)  # migrate once, so that every mode starts against an up-to-date schema
+
+    statements = []
+    event.listen(Engine, 'before_cursor_execute', lambda *_: statements.append(1))
+    modes = [
+        ('exists + create_all', lambda: legacy_start(database_uri)),
+        ('auto migrate', lambda: make_app(database_uri, DB_AUTO_MIGRATE=True)),
+        ('version check', lambda: make_app(database_uri, DB_AUTO_MIGRATE=False)),
+    ]
+    for name, start in modes:
+        ms, statements_per_start = timed(start, args.starts, statements)
+        print(f"{name:20} {ms:8.1f} ms/start (median)  {statements_per_start:5.1f} statements/start")
+
+
+if __name__ == '__main__':
+    main()
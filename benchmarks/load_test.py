@@ -0,0 +1,287 @@
+"""
+Load test of the production profile: app.serve_production (waitress, WAITRESS_THREADS threads, the production
+connection limit and channel timeout) in its own process, on a database seeded from data.sql scaled up
+`--scale` times, driven with a mix of reads, writes and analytics calls at fixed arrival rates.
+
+Each step offers one rate for `--duration` seconds. Requests are sent on schedule whether or not earlier ones
+have finished (an open model), and latency counts from the scheduled time, so queueing in front of a saturated
+server shows up in the percentiles. The first step whose achieved throughput falls below 90% of the offered
+rate, whose p99 exceeds `--slo-ms` or whose error rate exceeds 1% is reported as the saturation point.
+
+    python -m benchmarks.load_test [--rates 25,50,100,200] [--duration 10] [--mix read=80,write=15,analytics=5]
+                                   [--report load.json] [--database-uri mysql://...]
+"""
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.support import argument_parser, make_app, seed_from_data_sql
+
+ACHIEVED_RATIO = 0.9
+MAX_ERROR_RATE = 0.01
+REQUEST_TIMEOUT = 30.0
+
+# (method, path, body) of one request, built from random seeded ids
+Call = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+def operations(rows: Dict[str, int]) -> Dict[str, List[Tuple[str, Callable[[random.Random], Call]]]]:
+    """
+    Named calls per category; `rows` is the seeded row count per table.
+    """
+    def key(rng: random.Random, table: str) -> int:
+        return rng.randint(1, rows[table])
+
+    def reading_time(rng: random.Random) -> str:
+        return (datetime(2024, 1, 1) + timedelta(seconds=rng.randrange(365 * 86400))).isoformat(sep=' ')
+
+    return {
+        'read': [
+            ('get station', lambda rng: ('GET', f"/stations/{key(rng, 'station')}", None)),
+            ('get battery level', lambda rng: ('GET', f"/battery-levels/{key(rng, 'battery_level')}", None)),
+            ('page solar panels', lambda rng: ('GET', '/solar-panels?limit=100', None)),
+            ('batteries of station',
+             lambda rng: ('GET', f"/batteries/get-batteries-after-station/{key(rng, 'station')}", None)),
+            ('mget owners',
+             lambda rng: ('POST', '/owners/_mget', {'ids': [key(rng, 'owner') for _ in range(20)]})),
+        ],
+        'write': [
+            ('create battery level', lambda rng: ('POST', '/battery-levels', {
+                'date_time': reading_time(rng), 'charge_level': rng.uniform(0, 100),
+                'battery_id': key(rng, 'battery')})),
+            ('create energy sale', lambda rng: ('POST', '/energy-sales', {
+                'energy_sold': rng.uniform(10, 500), 'price_per_kwh': 0.15, 'date_time': reading_time(rng),
+                'station_id': key(rng, 'station')})),
+            ('patch station', lambda rng: ('PATCH', f"/stations/{key(rng, 'station')}",
+                                           {'total_capacity': rng.uniform(1000, 10000)})),
+        ],
+        'analytics': [
+            ('energy sold monthly', lambda rng: ('GET', '/energy-sales/calculate-energy-sold/monthly', None)),
+            ('energy sold daily', lambda rng: ('GET', '/energy-sales/calculate-energy-sold/daily', None)),
+            ('stations of owner',
+             lambda rng: ('GET', f"/owner-has-stations/get-stations-after-owner/{key(rng, 'owner')}", None)),
+            ('panel production',
+             lambda rng: ('GET', f"/solar-panels/{key(rng, 'solar_panel')}/production", None)),
+        ],
+    }
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def serve(database_uri: str, port: int, threads: int) -> None:
+    """
+    Server process: the app as production runs it, on an already seeded database.
+    """
+    from app import serve_production
+
+    # saturation already shows in the client's latencies, one warning per queued task would drown the report
+    logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+    serve_production(make_app(database_uri), host='127.0.0.1', port=port, threads=threads)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            try:
+                connection.request('GET', '/stats/pool')
+                if connection.getresponse().status == 200:
+                    return
+            finally:
+                connection.close()
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+        time.sleep(0.1)
+
+
+class Client:
+    """
+    Sends calls over one keep-alive connection per worker thread and records each outcome.
+    """
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.results: List[Tuple[str, str, float, bool]] = []
+
+    def send(self, category: str, name: str, call: Call, due: float) -> None:
+        method, path, body = call
+        ok = False
+        try:
+            connection = self._connection()
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = connection.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            self._local.connection = None
+        latency = time.perf_counter() - due
+        with self._lock:
+            self.results.append((category, name, latency, ok))
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=REQUEST_TIMEOUT)
+            self._local.connection = connection
+        return connection
+
+
+def run_step(port: int, rate: float, duration: float, mix: Dict[str, float], calls, concurrency: int,
+             rng: random.Random) -> Dict[str, Any]:
+    client = Client(port)
+    categories = list(mix)
+    weights = [mix[category] for category in categories]
+    total = max(1, int(rate * duration))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for i in range(total):
+            due = started + i / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            category = rng.choices(categories, weights)[0]
+            name, build = rng.choice(calls[category])
+            executor.submit(client.send, category, name, build(rng), due)
+    elapsed = time.perf_counter() - started
+    return summarize(rate, elapsed, client.results)
+
+
+def summarize(rate: float, elapsed: float, results: List[Tuple[str, str, float, bool]]) -> Dict[str, Any]:
+    def stats(latencies: List[float], errors: int) -> Dict[str, Any]:
+        latencies = sorted(latencies)
+        count = len(latencies)
+        return {
+            'requests': count,
+            'errors': errors,
+            'error_rate': errors / count if count else 0.0,
+            'latency_ms': {
+                'p50': percentile_ms(latencies, 0.50),
+                'p95': percentile_ms(latencies, 0.95),
+                'p99': percentile_ms(latencies, 0.99),
+                'max': 1000 * latencies[-1] if latencies else None,
+                'mean': 1000 * statistics.fmean(latencies) if latencies else None,
+            },
+        }
+
+    step = {'offered_rps': rate, 'achieved_rps': len(results) / elapsed}
+    step.update(stats([result[2] for result in results], sum(not result[3] for result in results)))
+    by_call: Dict[Tuple[str, str], List[Tuple[str, str, float, bool]]] = {}
+    for result in results:
+        by_call.setdefault(result[:2], []).append(result)
+    step['calls'] = {
+        f"{category}: {name}": stats([result[2] for result in group], sum(not result[3] for result in group))
+        for (category, name), group in sorted(by_call.items())
+    }
+    return step
+
+
+def percentile_ms(sorted_latencies: List[float], fraction: float) -> Optional[float]:
+    if not sorted_latencies:
+        return None
+    return 1000 * sorted_latencies[min(len(sorted_latencies) - 1, int(fraction * len(sorted_latencies)))]
+
+
+def saturated(step: Dict[str, Any], slo_ms: float) -> bool:
+    return (step['achieved_rps'] < ACHIEVED_RATIO * step['offered_rps'] or step['error_rate'] > MAX_ERROR_RATE
+            or step['latency_ms']['p99'] is None or step['latency_ms']['p99'] > slo_ms)
+
+
+def main() -> None:
+    from app import WAITRESS_THREADS, WAITRESS_CHANNEL_TIMEOUT, WAITRESS_CONNECTION_LIMIT
+
+    parser = argument_parser(__doc__)
+    parser.add_argument('--scale', type=int, default=50, help='Copies of the data.sql rows to load')
+    parser.add_argument('--rates', default='25,50,100,200', help='Offered requests/second, one step each')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per step')
+    parser.add_argument('--mix', default='read=80,write=15,analytics=5', help='Weights of the call categories')
+    parser.add_argument('--threads', type=int, default=WAITRESS_THREADS, help='Waitress threads')
+    parser.add_argument('--concurrency', type=int, default=256, help='Client threads (open connections)')
+    parser.add_argument('--slo-ms', type=float, default=500.0, help='p99 above which a step counts as saturated')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--report', help='Write the JSON report to this file (default: stdout)')
+    args = parser.parse_args()
+
+    # the server process needs to see the same database, so the in-memory default becomes a temporary file
+    database_uri = args.database_uri
+    if database_uri == 'sqlite://':
+        database_uri = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load.db')
+    mix = parse_mix(args.mix)
+    unknown = set(mix) - set(operations({}))
+    if unknown:
+        parser.error(f"Unknown categories in --mix: {', '.join(sorted(unknown))}")
+    calls = operations(seed_from_data_sql(make_app(database_uri), args.scale))
+
+    port = free_port()
+    server = multiprocessing.get_context('spawn').Process(target=serve, args=(database_uri, port, args.threads),
+                                                          daemon=True)
+    server.start()
+    try:
+        wait_until_up(port)
+        rng = random.Random(args.seed)
+        steps = []
+        for rate in (float(rate) for rate in args.rates.split(',')):
+            step = run_step(port, rate, args.duration, mix, calls, args.concurrency, rng)
+            steps.append(step)
+            print(f"offered {rate:8.1f}/s  achieved {step['achieved_rps']:8.1f}/s  "
+                  f"p50 {step['latency_ms']['p50']:8.1f} ms  p95 {step['latency_ms']['p95']:8.1f} ms  "
+                  f"p99 {step['latency_ms']['p99']:8.1f} ms  errors {100 * step['error_rate']:5.1f}%", flush=True)
+    finally:
+        server.terminate()
+        server.join()
+
+    first = next((i for i, step in enumerate(steps) if saturated(step, args.slo_ms)), len(steps))
+    report = {
+        'profile': {
+            'threads': args.threads,
+            'connection_limit': WAITRESS_CONNECTION_LIMIT,
+            'channel_timeout': WAITRESS_CHANNEL_TIMEOUT,
+        },
+        'database': database_uri.split(':')[0],
+        'scale': args.scale,
+        'mix': mix,
+        'duration': args.duration,
+        'concurrency': args.concurrency,
+        'slo_ms': args.slo_ms,
+        'steps': steps,
+        'saturation': {
+            'first_saturated_rps': steps[first]['offered_rps'] if first < len(steps) else None,
+            'max_sustained_rps': steps[first - 1]['offered_rps'] if first else None,
+        },
+    }
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
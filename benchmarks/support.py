@@ -0,0 +1,91 @@
+import argparse
+import re
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List
+
+from flask import Flask
+
+from my_project import create_app, db
+
+DEFAULT_DATABASE_URI = 'sqlite://'
+DATA_SQL = Path(__file__).resolve().parent.parent / 'data.sql'
+
+
+def argument_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--database-uri', default=DEFAULT_DATABASE_URI,
+                        help='Database to run against (default: in-memory SQLite)')
+    return parser
+
+
+def make_app(database_uri: str = DEFAULT_DATABASE_URI, **extra_config: Any) -> Flask:
+    config: Dict[str, Any] = {
+        'SQLALCHEMY_DATABASE_URI': database_uri,
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        # benchmarks start from an empty database
+        'DB_AUTO_MIGRATE': True,
+    }
+    config.update(extra_config)
+    return create_app(config)
+
+
+def seed_reference_rows(app: Flask) -> None:
+    """
+    Inserts one row per parent table so that readings and sales have valid foreign keys.
+    """
+    from my_project.auth.domain import Location, Station, PanelType, SolarPanel, Battery
+
+    with app.app_context():
+        location = Location(city='Kyiv', street='Shevchenka St.')
+        station = Station(total_capacity=5000.0, installation_date=date(2022, 1, 15), location=location)
+        panel_type = PanelType(type_name='Monocrystalline', description='High efficiency and longevity')
+        db.session.add_all([
+            location, station, panel_type,
+            SolarPanel(installation_date=date(2022, 1, 20), panel_type=panel_type, station=station),
+            Battery(capacity='100 kWh', installation_date=date(2022, 1, 25), station=station),
+        ])
+        db.session.commit()
+
+
+def data_sql_inserts() -> List[str]:
+    """
+    The INSERT statements of data.sql (its USE and procedure definitions are MySQL only).
+    """
+    statements = (statement.strip() for statement in DATA_SQL.read_text().split(';'))
+    return [statement for statement in statements if statement.upper().startswith('INSERT INTO')]
+
+
+def seed_from_data_sql(app: Flask, scale: int = 1) -> Dict[str, int]:
+    """
+    Loads data.sql into an empty database, then adds `scale - 1` copies of every row whose ids and foreign
+    keys are shifted to point into the same copy, so relationships keep the shape of the original data.
+    Rebuilds the energy sale rollups and returns the row count per table.
+    """
+    from my_project.auth.controller import energy_sale_controller
+
+    with app.app_context():
+        with db.engine.begin() as connection:
+            names = set()
+            for statement in data_sql_inserts():
+                connection.exec_driver_sql(statement)
+                names.add(re.match(r"INSERT INTO `?(\w+)", statement, re.IGNORECASE).group(1))
+            originals = {table: connection.execute(table.select().order_by(table.c.id)).mappings().all()
+                         for table in db.metadata.sorted_tables if table.name in names}
+            sizes = {table.name: len(rows) for table, rows in originals.items()}
+            for copy in range(1, scale):
+                for table, rows in originals.items():
+                    shifted = []
+                    for row in rows:
+                        row = dict(row)
+                        row['id'] += copy * sizes[table.name]
+                        for foreign_key in table.foreign_keys:
+                            row[foreign_key.parent.name] += copy * sizes[foreign_key.column.table.name]
+                        shifted.append(row)
+                    connection.execute(table.insert(), shifted)
+        energy_sale_controller.rebuild_rollups()
+        return {name: size * scale for name, size in sizes.items()}
+
+
+def reading_time(i: int) -> str:
+    return (datetime(2023, 1, 1) + timedelta(minutes=5 * i)).isoformat(sep=' ')
@@ -5,16 +5,31 @@ from typing import Dict, Any
 
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy_utils import database_exists, create_database
-from flasgger import Swagger
 
+from .api_docs import init_api_docs
 from .auth.route import register_routes
+from .commands import register_commands
+from .compression import init_compression
+from .json_provider import IsoJSONProvider, JSON_PROVIDER
+from .migrations import DB_AUTO_MIGRATE, DB_CHECK_SCHEMA, check_schema, migrate
+from .replicas import RoutingSession
 
 SECRET_KEY = "SECRET_KEY"
 SQLALCHEMY_DATABASE_URI = "SQLALCHEMY_DATABASE_URI"
+SQLALCHEMY_ENGINE_OPTIONS = "SQLALCHEMY_ENGINE_OPTIONS"
+SQLALCHEMY_REPLICA_URIS = "SQLALCHEMY_REPLICA_URIS"
+DB_REPLICA_MAX_LAG = "DB_REPLICA_MAX_LAG"
+DB_REPLICA_CHECK_INTERVAL = "DB_REPLICA_CHECK_INTERVAL"
+ENTITY_CACHE_ENABLED = "ENTITY_CACHE_ENABLED"
+ENTITY_CACHE_BACKEND = "ENTITY_CACHE_BACKEND"
+ENTITY_CACHE_MAX_SIZE = "ENTITY_CACHE_MAX_SIZE"
+ENTITY_CACHE_TTL = "ENTITY_CACHE_TTL"
+PROCEDURE_CACHE_ENABLED = "PROCEDURE_CACHE_ENABLED"
+PROCEDURE_CACHE_MAX_SIZE = "PROCEDURE_CACHE_MAX_SIZE"
+PROCEDURE_CACHE_TTL = "PROCEDURE_CACHE_TTL"
 
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 todos = {}
 
@@ -23,50 +38,66 @@ def create_app(app_config: Dict[str, Any]) -> Flask:
     app = Flask(__name__)
     app.config["SECRET_KEY"] = secrets.token_hex(16)
     app.config = {**app.config, **app_config}
-
-    swagger_config = {
-        "headers": [],
-        "specs": [
-            {
-                "endpoint": 'rest',
-                "route": '/rest_1.json',
-                "rule_filter": lambda rule: True,
-                "model_filter": lambda tag: True,
-            }
-        ],
-        "static_url_path": "/flasgger_static",
-        "swagger_ui": True,
-        "specs_route": "/apidocs/",
-        "dom_id": "#swagger-ui",
-        "deepLinking": True,
-        "docExpansion": "list",
-        "filter": True,
-        "layout": "BaseLayout"
-    }
-    
-    swagger_template = {
-        "swagger": "2.0",
-        "info": {
-            "title": "REST-endpoints",
-            "version": "1.0.0"
-        },
-        "schemes": ["http"]
-    }
-    
-    Swagger(app, config=swagger_config, template=swagger_template)
+    # "default" keeps Flask's provider, with its RFC 822 dates, for clients that still parse those
+    if app.config.get(JSON_PROVIDER, 'iso') == 'iso':
+        app.json = IsoJSONProvider(app)
 
     _init_db(app)
+    _init_replicas(app)
+    _init_cache(app)
     register_routes(app)
+    init_api_docs(app)
+    register_commands(app)
+    init_compression(app)
 
     return app
 
 
 def _init_db(app: Flask) -> None:
+    _init_pool(app)
     db.init_app(app)
 
-    if not database_exists(app.config[SQLALCHEMY_DATABASE_URI]):
-        create_database(app.config[SQLALCHEMY_DATABASE_URI])
+    # creating and migrating the schema is opt-in, a plain start only reads schema_version
+    if app.config.get(DB_AUTO_MIGRATE, False):
+        migrate(app)
+    elif app.config.get(DB_CHECK_SCHEMA, True):
+        check_schema(app)
+
+
+def _init_pool(app: Flask) -> None:
+    from .pool import engine_options
+
+    # SQLite (tests, benchmarks) keeps the pool Flask-SQLAlchemy picks for it
+    if SQLALCHEMY_ENGINE_OPTIONS not in app.config and not app.config[SQLALCHEMY_DATABASE_URI].startswith('sqlite'):
+        app.config[SQLALCHEMY_ENGINE_OPTIONS] = engine_options(app.config)
+
+
+def _init_replicas(app: Flask) -> None:
+    from sqlalchemy import create_engine
+    from .replicas import replica_router
+
+    # replicas keep SQLAlchemy's own QueuePool, so /stats/pool only counts checkouts on the primary
+    options = {key: value for key, value in app.config.get(SQLALCHEMY_ENGINE_OPTIONS, {}).items()
+               if key != 'poolclass'}
+    engines = [create_engine(uri, **options)
+               for uri in app.config.get(SQLALCHEMY_REPLICA_URIS) or []]
+    replica_router.configure(engines, max_lag=app.config.get(DB_REPLICA_MAX_LAG),
+                             check_interval=app.config.get(DB_REPLICA_CHECK_INTERVAL, 5.0))
+
+
+def _init_cache(app: Flask) -> None:
+    from .auth.dao.cache import entity_cache, table_versions, procedure_cache, LocalCacheBackend
 
-    import my_project.auth.domain
-    with app.app_context():
-        db.create_all()
+    shared_backend = app.config.get(ENTITY_CACHE_BACKEND)
+    backend = shared_backend or LocalCacheBackend(
+        max_size=app.config.get(ENTITY_CACHE_MAX_SIZE, 10000),
+        ttl=app.config.get(ENTITY_CACHE_TTL, 30.0),
+    )
+    entity_cache.configure(backend, enabled=app.config.get(ENTITY_CACHE_ENABLED, True))
+    procedure_backend = shared_backend or LocalCacheBackend(
+        max_size=app.config.get(PROCEDURE_CACHE_MAX_SIZE, 1000),
+        ttl=app.config.get(PROCEDURE_CACHE_TTL, 300.0),
+    )
+    procedure_cache.configure(procedure_backend, enabled=app.config.get(PROCEDURE_CACHE_ENABLED, True))
+    # versions must be seen by every process serving the API, so they follow a shared backend
+    table_versions.configure(shared_backend)
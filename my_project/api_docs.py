@@ -0,0 +1,100 @@
+import hashlib
+import json
+import threading
+from typing import Any, Optional, Tuple
+
+from flask import Flask, Response, request
+
+SWAGGER_ENABLED = "SWAGGER_ENABLED"
+SWAGGER_SPEC_FILE = "SWAGGER_SPEC_FILE"
+
+SPEC_ENDPOINT = 'rest'
+SPEC_ROUTE = '/rest_1.json'
+
+SWAGGER_CONFIG = {
+    "headers": [],
+    "specs": [
+        {
+            "endpoint": SPEC_ENDPOINT,
+            "route": SPEC_ROUTE,
+            "rule_filter": lambda rule: True,
+            "model_filter": lambda tag: True,
+        }
+    ],
+    "static_url_path": "/flasgger_static",
+    "swagger_ui": True,
+    "specs_route": "/apidocs/",
+    "dom_id": "#swagger-ui",
+    "deepLinking": True,
+    "docExpansion": "list",
+    "filter": True,
+    "layout": "BaseLayout"
+}
+
+SWAGGER_TEMPLATE = {
+    "swagger": "2.0",
+    "info": {
+        "title": "REST-endpoints",
+        "version": "1.0.0"
+    },
+    "schemes": ["http"]
+}
+
+
+class SpecCache:
+    """
+    The serialized spec and its ETag, built from the route docstrings on first use (or read from a
+    prebuilt SWAGGER_SPEC_FILE), so that flasgger parses the YAML at most once per process.
+    """
+
+    def __init__(self, swagger: Any, spec_file: Optional[str] = None) -> None:
+        self._swagger = swagger
+        self._lock = threading.Lock()
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        if spec_file is not None:
+            with open(spec_file, 'rb') as f:
+                self._set(f.read())
+
+    def get(self) -> Tuple[bytes, str]:
+        if self._body is None:
+            with self._lock:
+                if self._body is None:
+                    self._set(json.dumps(self._swagger.get_apispecs(SPEC_ENDPOINT), sort_keys=True).encode())
+        return self._body, self._etag
+
+    def _set(self, body: bytes) -> None:
+        self._etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self._body = body
+
+
+def init_api_docs(app: Flask) -> None:
+    """
+    Registers the Swagger UI and the spec route, which answers from a SpecCache with an ETag.
+    With SWAGGER_ENABLED off neither is registered and flasgger isn't imported at all.
+    """
+    if not app.config.get(SWAGGER_ENABLED, True):
+        return
+    from flasgger import Swagger
+
+    swagger = Swagger(app, config=SWAGGER_CONFIG, template=SWAGGER_TEMPLATE)
+    spec_cache = SpecCache(swagger, app.config.get(SWAGGER_SPEC_FILE))
+
+    def spec() -> Response:
+        body, etag = spec_cache.get()
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+    app.view_functions[f'flasgger.{SPEC_ENDPOINT}'] = spec
+
+
+def export_spec(app: Flask, path: str) -> int:
+    """
+    Writes the spec of every registered route to `path`, to ship as a SWAGGER_SPEC_FILE build artifact.
+    Returns the number of bytes written.
+    """
+    body, _ = SpecCache(app.swag).get()
+    with open(path, 'wb') as f:
+        f.write(body)
+    return len(body)
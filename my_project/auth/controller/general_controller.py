@@ -1,47 +1,211 @@
+import base64
+import binascii
+import json
 from abc import ABC
-from typing import List, Dict
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple, Any, Iterator, Callable
 
 from http import HTTPStatus
 from flask import abort
+from sqlalchemy.exc import IntegrityError
+
+MAX_PAGE_LIMIT = 1000
+MAX_BULK_SIZE = 10000
+MAX_IDS = 10000
 
 
 class GeneralController(ABC):
 
     _service = None
 
-    def find_all(self) -> List[object]:
-        return [x.put_into_dto() for x in self._service.find_all()]
+    def find_all(self, fields: Optional[List[str]] = None, include: Optional[List[str]] = None) -> List[object]:
+        try:
+            return [_to_dto(x, fields, include) for x in self._service.find_all(fields, include)]
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+
+    def iter_all(self, fields: Optional[List[str]] = None, include: Optional[List[str]] = None) -> Iterator[object]:
+        """
+        Validates fields and includes right away, so invalid ones abort before a streamed response begins.
+        """
+        try:
+            objs = self._service.iter_all(fields, include)
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        return (_to_dto(x, fields, include) for x in objs)
 
-    def find_by_id(self, key: int) -> object:
-        obj = self._service.find_by_id(key)
-        if obj is None:
+    def find_page(self, limit: int, cursor: Optional[str] = None, order_by: str = 'id',
+                  fields: Optional[List[str]] = None,
+                  include: Optional[List[str]] = None) -> Tuple[List[object], Optional[str]]:
+        """
+        Returns one page of DTOs and the cursor of the next page (None on the last page).
+        """
+        if not 0 < limit <= MAX_PAGE_LIMIT:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        try:
+            key_names = self._service.keyset_names(order_by)
+            after = _decode_cursor(cursor) if cursor else None
+            objs, more = self._limited(lambda n: self._service.find_page(n, order_by, after, fields, include), limit)
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        dtos = [_to_dto(x, fields, include) for x in objs]
+        return dtos, _encode_cursor([dtos[-1][name] for name in key_names]) if more else None
+
+    def find_by_id(self, key: int, fields: Optional[List[str]] = None, include: Optional[List[str]] = None) -> object:
+        try:
+            dto = self._service.find_dto_by_id(key, fields, include)
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        if dto is None:
             abort(HTTPStatus.NOT_FOUND)
-        return obj.put_into_dto()
+        return dto
+
+    def find_by_ids(self, keys: List[int], fields: Optional[List[str]] = None,
+                    include: Optional[List[str]] = None) -> Dict[str, List[object]]:
+        """
+        DTOs of the given ids in request order (each once) and the ids that don't exist.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not 0 < len(keys) <= MAX_IDS:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        try:
+            dtos = {dto['id']: dto for dto in (_to_dto(x, fields, include)
+                                               for x in self._service.find_by_ids(keys, fields, include))}
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        return {
+            'items': [dtos[key] for key in keys if key in dtos],
+            'missing': [key for key in keys if key not in dtos],
+        }
+
+    def version(self, include: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Version of the rows a read returns, None when there is none to tag it with
+        (also for an unknown `include`, which the read itself answers with 422).
+        """
+        try:
+            return self._service.version(include)
+        except ValueError:
+            return None
 
     def create(self, obj: object) -> object:
-        return self._service.create(obj).put_into_dto()
+        try:
+            return self._service.create(obj).put_into_dto()
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
 
-    def create_all(self, obj_list: List[object]) -> List[object]:
-        return list(map(lambda x: x.put_into_dto(), self._service.create(obj_list)))
+    def create_all(self, obj_list: List[object], return_ids: bool = False) -> Dict[str, object]:
+        if len(obj_list) > MAX_BULK_SIZE:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        try:
+            ids = self._service.create_all(obj_list, return_ids)
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        except IntegrityError:
+            abort(HTTPStatus.CONFLICT)
+        result = {'created': len(obj_list)}
+        if return_ids:
+            result['ids'] = ids
+        return result
 
     def update(self, key: int, new_obj: object) -> None:
-        obj = self._service.find_by_id(key)
-        if obj is None:
+        try:
+            found = self._service.update(key, new_obj)
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        except IntegrityError:
+            abort(HTTPStatus.CONFLICT)
+        if not found:
             abort(HTTPStatus.NOT_FOUND)
-        self._service.update(key, new_obj)
 
     def patch(self, key: int, value_dict: Dict[str, object]) -> None:
-        obj = self._service.find_by_id(key)
-        if obj is None:
+        if not isinstance(value_dict, dict):
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        try:
+            found = self._service.patch(key, value_dict)
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        except IntegrityError:
+            abort(HTTPStatus.CONFLICT)
+        if not found:
             abort(HTTPStatus.NOT_FOUND)
-        for field_name, value in value_dict.items():
-            self._service.patch(key, field_name, value)
 
     def delete(self, key: int) -> None:
-        obj = self._service.find_by_id(key)
-        if obj is None:
+        try:
+            found = self._service.delete(key)
+        except IntegrityError:
+            abort(HTTPStatus.CONFLICT)
+        if not found:
             abort(HTTPStatus.NOT_FOUND)
-        self._service.delete(key)
 
     def delete_all(self) -> None:
         self._service.delete_all()
+
+    @staticmethod
+    def _related_page(fetch: Callable[..., List[Dict[str, Any]]], key: int, key_name: str,
+                      limit: Optional[int] = None, cursor: Optional[str] = None,
+                      fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Runs a `get_*_after_*` DAO query, one keyset page of it when `limit` is given, and returns the rows
+        with the cursor of the next page (None on the last page or without `limit`).
+        """
+        if limit is not None and not 0 < limit <= MAX_PAGE_LIMIT:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        if limit is None and cursor is not None:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        try:
+            after = _decode_cursor(cursor) if cursor else None
+            rows, more = GeneralController._limited(lambda n: fetch(key, n, after, fields), limit)
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        return rows, _encode_cursor([rows[-1][key_name]]) if more else None
+
+    @staticmethod
+    def _limited(fetch: Callable[[Optional[int]], List[Any]],
+                 limit: Optional[int]) -> Tuple[List[Any], bool]:
+        """
+        Calls `fetch` with a row limit and returns at most `limit` rows and whether there were more.
+        One extra row tells, so no COUNT query is needed. Without `limit` every row is returned.
+        """
+        if limit is None:
+            return fetch(None), False
+        rows = fetch(limit + 1)
+        return rows[:limit], len(rows) > limit
+
+    @staticmethod
+    def _parse_time_range(date_from: Optional[str],
+                          date_to: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Parses optional ISO-8601 bounds of a time window, aborting with 422 if they are malformed or reversed.
+        """
+        try:
+            time_from = datetime.fromisoformat(date_from) if date_from else None
+            time_to = datetime.fromisoformat(date_to) if date_to else None
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        if time_from is not None and time_to is not None and time_from >= time_to:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        return time_from, time_to
+
+
+def _to_dto(obj: Any, fields: Optional[List[str]], include: Optional[List[str]] = None) -> Dict[str, object]:
+    # with fields, the DAO returns plain rows of the selected columns instead of domain objects
+    if fields is not None:
+        return dict(obj._mapping)
+    return obj.put_into_dto() if include is None else obj.put_into_dto_with(include)
+
+
+def _encode_cursor(key: List[Any]) -> str:
+    raw = json.dumps(key, default=lambda value: value.isoformat(), separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(key, list):
+        raise ValueError("Malformed cursor")
+    return key
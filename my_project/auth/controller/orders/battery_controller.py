@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict, Any, Optional, Tuple
 
 from my_project.auth.service import battery_service
 from my_project.auth.controller.general_controller import GeneralController
@@ -8,5 +8,8 @@ class BatteryController(GeneralController):
 
     _service = battery_service
 
-    def get_batteries_after_station(self, station_id) -> List[object]:
-        return self._service.get_batteries_after_station(station_id)
+    def get_batteries_after_station(self, station_id: int, limit: Optional[int] = None,
+                                    cursor: Optional[str] = None, fields: Optional[List[str]] = None
+                                    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return self._related_page(self._service.get_batteries_after_station, station_id, 'battery_id',
+                                  limit, cursor, fields)
@@ -1,9 +1,26 @@
-from typing import List
+from http import HTTPStatus
+from typing import Dict, Optional
+
+from flask import abort
 
 from my_project.auth.service import battery_level_service
 from my_project.auth.controller.general_controller import GeneralController
 
+MAX_LEVELS_LIMIT = 10000
+
 
 class BatteryLevelController(GeneralController):
 
     _service = battery_level_service
+
+    def find_levels(self, battery_id: int, date_from: Optional[str], date_to: Optional[str],
+                    limit: int = MAX_LEVELS_LIMIT) -> Dict[str, object]:
+        if not 0 < limit <= MAX_LEVELS_LIMIT:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        time_from, time_to = self._parse_time_range(date_from, date_to)
+        levels, truncated = self._limited(
+            lambda n: self._service.find_levels(battery_id, time_from, time_to, n), limit)
+        return {
+            'levels': [x.put_into_dto() for x in levels],
+            'truncated': truncated,
+        }
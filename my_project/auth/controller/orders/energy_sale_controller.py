@@ -1,5 +1,8 @@
+from http import HTTPStatus
 from typing import List
 
+from flask import abort
+
 from my_project.auth.service import energy_sale_service
 from my_project.auth.controller.general_controller import GeneralController
 
@@ -9,4 +12,10 @@ class EnergySaleController(GeneralController):
     _service = energy_sale_service
 
     def get_energy_sold(self, type: str) -> List[object]:
-        return self._service.get_energy_sold(type)
+        try:
+            return self._service.get_energy_sold(type)
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+
+    def rebuild_rollups(self) -> int:
+        return self._service.rebuild_rollups()
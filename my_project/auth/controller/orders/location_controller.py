@@ -1,3 +1,8 @@
+from http import HTTPStatus
+from typing import Dict
+
+from flask import abort
+
 from my_project.auth.service import location_service
 from my_project.auth.controller.general_controller import GeneralController
 
@@ -6,5 +11,8 @@ class LocationController(GeneralController):
 
     _service = location_service
 
-    def insert_location(self, city: str, street: str):
-        self._service.insert_location(city, street)
\ No newline at end of file
+    def insert_location(self, city: str, street: str) -> Dict[str, object]:
+        location = self._service.insert_location(city, street)
+        if location is None:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        return location.put_into_dto()
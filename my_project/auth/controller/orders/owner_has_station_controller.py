@@ -1,4 +1,7 @@
-from typing import List
+from http import HTTPStatus
+from typing import List, Dict, Any, Optional, Tuple
+
+from flask import abort
 
 from my_project.auth.service import owner_has_station_service
 from my_project.auth.controller.general_controller import GeneralController
@@ -8,11 +11,17 @@ class OwnerHasStationController(GeneralController):
 
     _service = owner_has_station_service
 
-    def get_owners_after_station(self, station_id) -> List[object]:
-        return self._service.get_owners_after_station(station_id)
+    def get_owners_after_station(self, station_id: int, limit: Optional[int] = None, cursor: Optional[str] = None,
+                                 fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return self._related_page(self._service.get_owners_after_station, station_id, 'id', limit, cursor, fields)
 
-    def get_stations_after_owner(self, owner_id) -> List[object]:
-        return self._service.get_stations_after_owner(owner_id)
+    def get_stations_after_owner(self, owner_id: int, limit: Optional[int] = None, cursor: Optional[str] = None,
+                                 fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return self._related_page(self._service.get_stations_after_owner, owner_id, 'id', limit, cursor, fields)
 
-    def insert_owner_has_station(self, owner_id: int, station_id: int, ownership_percentage: float):
-        return self._service.insert_owner_has_station(owner_id, station_id, ownership_percentage)
+    def insert_owner_has_station(self, owner_id: int, station_id: int,
+                                 ownership_percentage: float) -> Dict[str, object]:
+        owner_has_station = self._service.insert_owner_has_station(owner_id, station_id, ownership_percentage)
+        if owner_has_station is None:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        return owner_has_station.put_into_dto()
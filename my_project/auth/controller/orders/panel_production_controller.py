@@ -1,7 +1,36 @@
+from http import HTTPStatus
+from typing import Dict, Optional
+
+from flask import abort, current_app
+
+from my_project.auth.dao.orders.panel_production_dao import AGGREGATES
 from my_project.auth.service import panel_production_service
 from my_project.auth.controller.general_controller import GeneralController
 
+BUCKETS = {
+    '5m': 5 * 60,
+    '1h': 60 * 60,
+    '1d': 24 * 60 * 60,
+}
+PRODUCTION_MAX_POINTS = "PRODUCTION_MAX_POINTS"
+
 
 class PanelProductionController(GeneralController):
 
     _service = panel_production_service
+
+    def aggregate_production(self, solar_panel_id: int, date_from: Optional[str], date_to: Optional[str],
+                             bucket: str, agg: str) -> Dict[str, object]:
+        aggregates = agg.split(',')
+        if bucket not in BUCKETS or not aggregates or not set(aggregates) <= AGGREGATES.keys():
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        time_from, time_to = self._parse_time_range(date_from, date_to)
+        max_points = current_app.config.get(PRODUCTION_MAX_POINTS, 1000)
+        points, truncated = self._limited(
+            lambda n: self._service.aggregate_production(solar_panel_id, time_from, time_to, BUCKETS[bucket],
+                                                         aggregates, n), max_points)
+        return {
+            'bucket': bucket,
+            'points': points,
+            'truncated': truncated,
+        }
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict, Any, Optional, Tuple
 
 from my_project.auth.service import solar_panel_service
 from my_project.auth.controller.general_controller import GeneralController
@@ -8,8 +8,14 @@ class SolarPanelController(GeneralController):
 
     _service = solar_panel_service
 
-    def get_solar_panels_after_panel_type(self, panel_type_id) -> List[object]:
-        return self._service.get_solar_panels_after_panel_type(panel_type_id)
+    def get_solar_panels_after_panel_type(self, panel_type_id: int, limit: Optional[int] = None,
+                                          cursor: Optional[str] = None, fields: Optional[List[str]] = None
+                                          ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return self._related_page(self._service.get_solar_panels_after_panel_type, panel_type_id, 'solar_panel_id',
+                                  limit, cursor, fields)
 
-    def get_solar_panels_after_station(self, station_id) -> List[object]:
-        return self._service.get_solar_panels_after_station(station_id)
+    def get_solar_panels_after_station(self, station_id: int, limit: Optional[int] = None,
+                                       cursor: Optional[str] = None, fields: Optional[List[str]] = None
+                                       ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return self._related_page(self._service.get_solar_panels_after_station, station_id, 'solar_panel_id',
+                                  limit, cursor, fields)
@@ -0,0 +1,261 @@
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+MISSING = object()
+
+
+class CacheBackend(ABC):
+    """
+    Key-value store behind the caches. Values are DTOs (or None), keys are strings,
+    so an implementation can live in another process (e.g. Redis or memcached).
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """
+        Returns the stored value or MISSING.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        """
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    In-process LRU with a time-to-live, safe to share between waitress threads.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EntityCache:
+    """
+    Read-through cache of DTOs by (table, id), including "not found" entries.
+
+    Entries are keyed by the version of their table as read before the row itself, like ProcedureCache
+    entries: a write replaces the version, so everything cached for the table is never read again, and a
+    reader that loaded a row just before a write can only store it under the version that write retired.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, enabled: bool = True) -> None:
+        self.backend = backend or self._new_backend()
+        self._owns_backend = backend is None
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def configure(self, backend: Optional[CacheBackend] = None, enabled: bool = True) -> None:
+        """
+        Starts over with empty counters. Only a backend the cache created itself is cleared:
+        a given one may be shared with TableVersions and other processes.
+        """
+        if backend is not None:
+            self.backend, self._owns_backend = backend, False
+        elif self._owns_backend:
+            self.backend.clear()
+        else:
+            self.backend, self._owns_backend = self._new_backend(), True
+        self.enabled = enabled
+        self.hits = self.negative_hits = self.misses = 0
+
+    @staticmethod
+    def _new_backend() -> CacheBackend:
+        return LocalCacheBackend()
+
+    def get(self, table: str, key: int, version: str) -> Tuple[bool, Optional[Dict[str, object]]]:
+        """
+        Returns (True, dto) on a hit, where dto is None for a cached "not found", and (False, None) on a miss.
+        """
+        if not self.enabled:
+            return False, None
+        value = self.backend.get(self._key(table, key, version))
+        with self._lock:
+            if value is MISSING:
+                self.misses += 1
+                return False, None
+            if value is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+        return True, value
+
+    def put(self, table: str, key: int, version: str, dto: Optional[Dict[str, object]]) -> None:
+        if self.enabled:
+            self.backend.set(self._key(table, key, version), dto)
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'hit_ratio': (self.hits + self.negative_hits) / lookups if lookups else None,
+        }
+
+    @staticmethod
+    def _key(table: str, key: int, version: str) -> str:
+        return f"{table}:{version}:{key}"
+
+
+class TableVersions:
+    """
+    Version token of every table, replaced after each committed write, with the time of that write.
+
+    Tokens are random rather than counted, so neither a restart nor an evicted entry can bring back
+    a version that was already handed out (e.g. in an ETag). An unknown table counts as written just now.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None) -> None:
+        self.backend = backend or LocalCacheBackend(ttl=float('inf'))
+
+    def configure(self, backend: Optional[CacheBackend] = None) -> None:
+        self.backend = backend or LocalCacheBackend(ttl=float('inf'))
+
+    def get(self, table: str) -> Tuple[str, float]:
+        """
+        Returns (token, wall clock time of the last write).
+        """
+        version = self.backend.get(self._key(table))
+        if version is MISSING:
+            version = self.bump(table)
+        return version
+
+    def bump(self, table: str) -> Tuple[str, float]:
+        version = (uuid.uuid4().hex, time.time())
+        self.backend.set(self._key(table), version)
+        return version
+
+    @staticmethod
+    def _key(table: str) -> str:
+        return f"{table}:version"
+
+
+class ProcedureCache:
+    """
+    Rows returned by read-only stored procedures, keyed by procedure, arguments and the versions
+    of the tables the procedure reads. A write to any of those tables changes the key,
+    so stale entries are never read again and just age out of the backend.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, enabled: bool = True) -> None:
+        self.backend = backend or self._new_backend()
+        self._owns_backend = backend is None
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def configure(self, backend: Optional[CacheBackend] = None, enabled: bool = True) -> None:
+        """
+        Like EntityCache.configure, never clears a backend it was given.
+        """
+        if backend is not None:
+            self.backend, self._owns_backend = backend, False
+        elif self._owns_backend:
+            self.backend.clear()
+        else:
+            self.backend, self._owns_backend = self._new_backend(), True
+        self.enabled = enabled
+        self.hits = self.misses = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def _new_backend() -> CacheBackend:
+        return LocalCacheBackend(max_size=1000, ttl=300.0)
+
+    def get(self, procedure: str, args: Sequence[Any], versions: Sequence[str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns the cached rows, or None on a miss. The rows are shared and must not be modified.
+        """
+        if not self.enabled:
+            return None
+        entry = self.backend.get(self._key(procedure, args, versions))
+        with self._lock:
+            if entry is MISSING:
+                self.misses += 1
+                return None
+            rows, elapsed = entry
+            self.hits += 1
+            self.saved_seconds += elapsed
+        return rows
+
+    def put(self, procedure: str, args: Sequence[Any], versions: Sequence[str],
+            rows: List[Dict[str, Any]], elapsed: float) -> None:
+        """
+        Stores rows together with the time the call took, which every later hit counts as saved.
+        """
+        if self.enabled:
+            self.backend.set(self._key(procedure, args, versions), (rows, elapsed))
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else None,
+            'saved_db_ms': 1000 * self.saved_seconds,
+        }
+
+    @staticmethod
+    def _key(procedure: str, args: Sequence[Any], versions: Sequence[str]) -> str:
+        return f"procedure:{procedure}:{':'.join(map(str, args))}:{':'.join(versions)}"
+
+
+entity_cache = EntityCache()
+table_versions = TableVersions()
+procedure_cache = ProcedureCache()
@@ -1,57 +1,418 @@
+import time
 from abc import ABC
-from typing import List
+from datetime import date, datetime
+from functools import lru_cache
+from typing import List, Dict, Optional, Sequence, Any, Iterator, Tuple, Callable
 
-from sqlalchemy import inspect
-from sqlalchemy.orm import Mapper
+from flask import current_app
+from sqlalchemy import and_, or_, Column, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.sql import Select
 
 from my_project import db
+from my_project.auth.dao.cache import entity_cache, table_versions, procedure_cache
+from my_project.auth.domain.i_dto import includable
+from my_project.replicas import replica_router, replica_read
+
+KEYSET_COLUMNS = ('id', 'date_time')
+STREAM_BATCH_SIZE = 1000
+IDS_CHUNK_SIZE = 1000
+USE_STORED_PROCEDURES = "USE_STORED_PROCEDURES"
 
 
 class GeneralDAO(ABC):
 
     _domain_type = None
     _session = db.session
+    _cache = entity_cache
+    _versions = table_versions
+    _procedure_cache = procedure_cache
+
+    def find_all(self, fields: Optional[Sequence[str]] = None, include: Optional[Sequence[str]] = None) -> List[object]:
+        return self._query(fields, include).all()
+
+    def find_page(self, limit: int, order_by: str = 'id', after: Optional[Sequence[Any]] = None,
+                  fields: Optional[Sequence[str]] = None, include: Optional[Sequence[str]] = None) -> List[object]:
+        """
+        Returns up to `limit` objects ordered by the keyset of `order_by`, starting right after the key `after`.
+        Raises ValueError if the table can't be ordered by `order_by` or `after` doesn't match its keyset.
+        With `fields`, returns rows of those columns plus the keyset.
+        """
+        key_columns = self._keyset_columns(order_by)
+        query = self._query(fields, include, key_columns)
+        if after is not None:
+            query = query.filter(self._keyset_after(key_columns, after))
+        return query.order_by(*key_columns).limit(limit).all()
+
+    def iter_all(self, batch_size: int = STREAM_BATCH_SIZE, fields: Optional[Sequence[str]] = None,
+                 include: Optional[Sequence[str]] = None) -> Iterator[object]:
+        """
+        Yields every object ordered by id, reading keyset pages of `batch_size` rows. Each page is fetched
+        completely before its `include` relationships are loaded, so no cursor stays open in between
+        (mysqlclient can't run the SELECT ... IN while a server-side cursor still has rows pending).
+        Raises ValueError right away for unknown fields or relationships.
+        """
+        self._query(fields, include)  # validates before the first page is read
+        return self._iter_pages(batch_size, fields, include)
+
+    def _iter_pages(self, batch_size: int, fields: Optional[Sequence[str]],
+                    include: Optional[Sequence[str]]) -> Iterator[object]:
+        after = None
+        while True:
+            page = self.find_page(batch_size, 'id', after, fields, include)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = [page[-1].id]
+
+    def keyset_names(self, order_by: str = 'id') -> List[str]:
+        return [column.name for column in self._keyset_columns(order_by)]
 
-    def find_all(self) -> List[object]:
-        return self._session.query(self._domain_type).all()
+    def find_by_id(self, key: int, include: Optional[Sequence[str]] = None) -> object:
+        return self._query(None, include).get(key)
 
-    def find_by_id(self, key: int) -> object:
-        return self._session.query(self._domain_type).get(key)
+    def find_by_ids(self, keys: Sequence[int], fields: Optional[Sequence[str]] = None,
+                    include: Optional[Sequence[str]] = None) -> List[object]:
+        """
+        Objects (or rows of `fields`) with the given ids in no particular order, read with one
+        `WHERE id IN (...)` per IDS_CHUNK_SIZE ids. Missing ids are simply absent.
+        """
+        id_column = self._domain_type.__table__.c.id
+        found = []
+        for start in range(0, len(keys), IDS_CHUNK_SIZE):
+            found.extend(self._query(fields, include).filter(id_column.in_(keys[start:start + IDS_CHUNK_SIZE])).all())
+        return found
+
+    def find_dto_by_id(self, key: int, fields: Optional[Sequence[str]] = None,
+                       include: Optional[Sequence[str]] = None) -> Optional[Dict[str, object]]:
+        """
+        Reads through the entity cache; a missing row is cached as None too.
+        The returned DTO is shared with the cache and must not be modified.
+        With `fields`, a cached DTO is cut down to them and a miss reads only those columns, bypassing the cache.
+        With `include`, or while replicas may lag behind the last write to the table (a replica could still
+        return the row as it was before that write), the row is always read from the database and not cached.
+        """
+        if include is not None:
+            self._query(fields, include)  # validates the combination
+            obj = self.find_by_id(key, include)
+            return None if obj is None else obj.put_into_dto_with(include)
+        table = self._domain_type.__tablename__
+        columns = None if fields is None else self._field_columns(fields)
+        # read before the row, so that a write committed in between retires what is cached below
+        version = self._settled_version(table)
+        if version is not None:
+            hit, dto = self._cache.get(table, key, version)
+            if hit:
+                return dto if dto is None or columns is None else {column.key: dto[column.key] for column in columns}
+        if columns is not None:
+            row = self._session.query(*columns).filter(self._domain_type.__table__.c.id == key).one_or_none()
+            return None if row is None else dict(row._mapping)
+        obj = self.find_by_id(key)
+        dto = None if obj is None else obj.put_into_dto()
+        if version is not None:
+            self._cache.put(table, key, version, dto)
+        return dto
+
+    def version(self, include: Optional[Sequence[str]] = None) -> Optional[str]:
+        """
+        Token that changes with every committed write to the table, and with `include` to the tables of
+        those related objects too. None while replicas may still lag behind the last write to any of them,
+        as rows read now can't be pinned to a version. Raises ValueError for an unknown relationship.
+        """
+        tables = [self._domain_type.__tablename__, *self._include_tables(include or ())]
+        versions = [self._settled_version(table) for table in tables]
+        return None if None in versions else ':'.join(versions)
 
     def create(self, obj: object) -> object:
+        """
+        Raises ValueError if a value doesn't fit its column.
+        """
+        self._coerce_object(obj)
         self._session.add(obj)
         self._session.commit()
+        self._invalidate_cache()
         return obj
 
-    def create_all(self, obj_list: List[object]) -> List[object]:
-        self._session.add_all(obj_list)
-        self._session.commit()
-        return obj_list
-
-    def update(self, key: int, in_obj: object) -> None:
-        domain_obj = self._session.query(self._domain_type).get(key)
-        mapper: Mapper = inspect(type(in_obj))  # Metadata
-        columns = mapper.columns._collection
-        for column_name, column_obj, *_ in columns:
-            if not column_obj.primary_key:
-                value = getattr(in_obj, column_name)
-                setattr(domain_obj, column_name, value)
-        self._session.commit()
+    def create_all(self, obj_list: List[object], return_ids: bool = False) -> List[int]:
+        """
+        Inserts all objects in one transaction. By default the rows go out as a single executemany and
+        no ids are returned; with `return_ids` they are flushed through the ORM to read the generated ids.
+        Rolls back and re-raises IntegrityError if any row is rejected; raises ValueError before writing
+        anything if a value doesn't fit its column.
+        """
+        if not obj_list:
+            return []
+        for obj in obj_list:
+            self._coerce_object(obj)
+        try:
+            if return_ids:
+                self._session.add_all(obj_list)
+                self._session.flush()
+                ids = [obj.id for obj in obj_list]
+            else:
+                columns = _value_columns(self._domain_type)
+                rows = [{column.key: getattr(obj, column.key) for column in columns} for obj in obj_list]
+                self._session.execute(self._domain_type.__table__.insert(), rows)
+                ids = []
+            self._session.commit()
+        except IntegrityError:
+            self._session.rollback()
+            raise
+        self._invalidate_cache()
+        return ids
+
+    def update(self, key: int, in_obj: object) -> bool:
+        """
+        Overwrites every non primary key column of the row with a single UPDATE.
+        Returns False if there is no row with such id. Raises ValueError if a value doesn't fit its column.
+        """
+        table = self._domain_type.__table__
+        values = self._coerce_values({column.key: getattr(in_obj, column.key)
+                                      for column in _value_columns(self._domain_type)})
+        return self._execute_write(table.update().where(table.c.id == key).values(values)) > 0
 
-    def patch(self, key: int, field_name: str, value: object) -> None:
-        domain_obj = self._session.query(self._domain_type).get(key)
-        setattr(domain_obj, field_name, value)
+    def patch(self, key: int, value_dict: Dict[str, object]) -> bool:
+        """
+        Sets the given columns of the row with a single UPDATE. Returns False if there is no row with such id.
+        Raises ValueError if some field is not a mapped, non primary key column or a value doesn't fit it.
+        """
+        self._check_patch_fields(value_dict)
+        value_dict = self._coerce_values(value_dict)
+        table = self._domain_type.__table__
+        return self._execute_write(table.update().where(table.c.id == key).values(value_dict)) > 0
+
+    def delete(self, key: int) -> bool:
+        """
+        Deletes the row with a single DELETE, without loading it or its relationships.
+        Returns False if there is no row with such id; re-raises IntegrityError if it is still referenced.
+        """
+        table = self._domain_type.__table__
+        return self._execute_write(table.delete().where(table.c.id == key)) > 0
+
+    def delete_all(self) -> None:
+        self._session.query(self._domain_type).delete()
         self._session.commit()
+        self._invalidate_cache()
 
-    def delete(self, key: int) -> None:
-        domain_obj = self._session.query(self._domain_type).get(key)
-        self._session.delete(domain_obj)
+    def _execute_write(self, statement) -> int:
+        """
+        Runs one DML statement in its own transaction and returns the number of matched rows.
+        """
         try:
+            result = self._session.execute(statement)
             self._session.commit()
-        except Exception:
+        except IntegrityError:
             self._session.rollback()
-            raise 
+            raise
+        self._invalidate_cache()
+        return result.rowcount
 
-    def delete_all(self) -> None:
-        self._session.query(self._domain_type).delete()
+    def _find_related(self, procedure: str, domain_types: Sequence[type], key: int, statement: Select,
+                      key_name: str, limit: Optional[int] = None, after: Optional[Sequence[Any]] = None,
+                      fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Rows of a `get_*_after_*` relationship query over the tables of `domain_types`, through the procedure cache.
+
+        Runs `statement`, a Core SELECT labelled like the result set of `procedure`, ordered by its `key_name`
+        column, starting after the key `after`, limited to `limit` rows and narrowed to `fields` (plus the key).
+        With USE_STORED_PROCEDURES set it CALLs `procedure` instead, which can do none of that.
+        Raises ValueError for unknown fields, a malformed `after`, or paging and fields with procedures.
+        """
+        if current_app.config.get(USE_STORED_PROCEDURES, False):
+            if limit is not None or after is not None or fields is not None:
+                raise ValueError("Pagination and fields need USE_STORED_PROCEDURES off")
+            return self._cached_rows(procedure, domain_types, (key,), lambda: self._call_procedure(procedure, key))
+
+        key_column = statement.selected_columns[key_name]
+        if fields is not None:
+            names = statement.selected_columns.keys()
+            if not fields or not set(names).issuperset(fields):
+                raise ValueError(f"Fields must be some of {', '.join(names)}")
+            statement = statement.with_only_columns(
+                *(column for column in statement.selected_columns if column.key in {key_name, *fields}))
+        if after is not None:
+            if len(after) != 1 or type(after[0]) is not int:
+                raise ValueError("Malformed cursor")
+            statement = statement.where(key_column > after[0])
+        statement = statement.order_by(key_column).limit(limit)
+        args = (key, limit, after and tuple(after), fields and tuple(fields))
+        return self._cached_rows(procedure, domain_types, args,
+                                 lambda: [dict(row) for row in self._session.execute(statement).mappings()])
+
+    def _cached_rows(self, name: str, domain_types: Sequence[type], args: Sequence[Any],
+                     load: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Rows from `load`, cached by name and args for as long as the tables of `domain_types` don't change.
+        """
+        versions = [self._settled_version(domain_type.__tablename__) for domain_type in domain_types]
+        cacheable = None not in versions
+        if cacheable:
+            rows = self._procedure_cache.get(name, args, versions)
+            if rows is not None:
+                return rows
+        started = time.perf_counter()
+        rows = load()
+        if cacheable:
+            self._procedure_cache.put(name, args, versions, rows, time.perf_counter() - started)
+        return rows
+
+    def _call_insert(self, procedure: str, **params: Any) -> Optional[object]:
+        """
+        CALLs an inserting procedure and returns the row it created (by LAST_INSERT_ID() on the same
+        connection), or None if it inserted nothing.
+        """
+        placeholders = ', '.join(f':{name}' for name in params)
+        # LAST_INSERT_ID() belongs to the pooled connection and is left alone by a CALL that inserts nothing,
+        # so without the reset it could be the id some earlier request inserted
+        self._session.execute(text("SELECT LAST_INSERT_ID(0)"))
+        self._session.execute(text(f"CALL {procedure}({placeholders})"), params)
+        key = self._session.execute(text("SELECT LAST_INSERT_ID()")).scalar()
         self._session.commit()
+        self._invalidate_cache()
+        return self.find_by_id(key) if key else None
+
+    def _call_procedure(self, procedure: str, *args: Any) -> List[Dict[str, Any]]:
+        placeholders = ', '.join(f':p{i}' for i in range(len(args)))
+        result = self._session.execute(replica_read(text(f"CALL {procedure}({placeholders})")),
+                                       {f'p{i}': arg for i, arg in enumerate(args)}).mappings().all()
+        return [dict(row) for row in result]
+
+    def _settled_version(self, table: str) -> Optional[str]:
+        token, written_at = self._versions.get(table)
+        if replica_router.engines and time.time() - written_at < (replica_router.max_lag or 0):
+            return None
+        return token
+
+    def _check_patch_fields(self, value_dict: Dict[str, object]) -> None:
+        columns = {column.key for column in _value_columns(self._domain_type)}
+        if not value_dict or not columns.issuperset(value_dict):
+            raise ValueError(f"Only {', '.join(sorted(columns))} can be patched")
+
+    def _coerce_values(self, values: Dict[str, object]) -> Dict[str, object]:
+        """
+        Column values converted up front (see _coerce_value), so a malformed one is a ValueError
+        instead of a StatementError from the middle of the write.
+        """
+        columns = self._domain_type.__table__.c
+        return {name: _coerce_value(columns[name], value) for name, value in values.items()}
+
+    def _coerce_object(self, obj: object) -> None:
+        for column in _value_columns(self._domain_type):
+            value = getattr(obj, column.key)
+            coerced = _coerce_value(column, value)
+            if coerced is not value:
+                setattr(obj, column.key, coerced)
+
+    def _invalidate_cache(self) -> None:
+        """
+        Bumps the table version, which retires the table's cached rows, procedure results and ETags.
+        Call after commit.
+        """
+        self._versions.bump(self._domain_type.__tablename__)
+
+    def _query(self, fields: Optional[Sequence[str]], include: Optional[Sequence[str]] = None,
+               extra_columns: Sequence[Column] = ()):
+        """
+        Query of whole objects, or of rows with only the requested columns (plus id and `extra_columns`).
+        Objects come with the `include` relationships loaded by one extra SELECT ... IN per relationship;
+        any other relationship raises when accessed instead of lazy loading one row at a time.
+        Raises ValueError for an unknown relationship, or for `include` together with `fields`.
+        """
+        if fields is None:
+            return self._session.query(self._domain_type).options(*self._include_options(include or ()))
+        if include is not None:
+            raise ValueError("fields and include can't be combined")
+        return self._session.query(*self._field_columns(fields, extra_columns))
+
+    def _include_options(self, include: Sequence[str]) -> List[Any]:
+        relationships = self._include_relationships(include)
+        return [selectinload(getattr(self._domain_type, key)) for key in relationships] + [raiseload('*')]
+
+    def _include_tables(self, include: Sequence[str]) -> List[str]:
+        mapper_relationships = inspect(self._domain_type).relationships
+        return [mapper_relationships[key].mapper.local_table.name for key in self._include_relationships(include)]
+
+    def _include_relationships(self, include: Sequence[str]) -> List[str]:
+        """
+        Relationship keys of the include names. Raises ValueError for an unknown one.
+        """
+        relationships = includable(self._domain_type)
+        if not set(relationships).issuperset(include):
+            raise ValueError(f"Include must be some of {', '.join(relationships) or 'nothing'}")
+        return [relationships[name] for name in include]
+
+    def _field_columns(self, fields: Sequence[str], extra_columns: Sequence[Column] = ()) -> List[Column]:
+        """
+        Columns of the requested fields in table order, always with id. Raises ValueError for an unknown field.
+        """
+        table = self._domain_type.__table__
+        if not fields or not set(table.c.keys()).issuperset(fields):
+            raise ValueError(f"Fields must be some of {', '.join(table.c.keys())}")
+        wanted = {'id', *fields, *(column.key for column in extra_columns)}
+        return [column for column in table.c if column.key in wanted]
+
+    def _keyset_columns(self, order_by: str) -> List[Column]:
+        table = self._domain_type.__table__
+        if order_by not in KEYSET_COLUMNS or order_by not in table.c:
+            raise ValueError(f"{table.name} can't be paginated by '{order_by}'")
+        if order_by == 'id':
+            return [table.c.id]
+        return [table.c[order_by], table.c.id]
+
+    @staticmethod
+    def _keyset_after(columns: List[Column], values: Sequence[Any]):
+        if len(values) != len(columns):
+            raise ValueError("Cursor doesn't match the requested ordering")
+        values = [_coerce_key(column, value) for column, value in zip(columns, values)]
+        # (a > :a) OR (a = :a AND id > :id) - expanded so MySQL can use a range scan on the index
+        clauses = []
+        for i, column in enumerate(columns):
+            equal = [columns[j] == values[j] for j in range(i)]
+            clauses.append(and_(*equal, column > values[i]))
+        return or_(*clauses)
+
+
+def _coerce_value(column: Column, value: Any) -> Any:
+    """
+    A value written to `column` as the column's Python type: ISO-8601 strings become dates and datetimes,
+    numbers and numeric strings become the column's number or string type. Raises ValueError for anything
+    else (e.g. an object, a list, a fractional number for an integer column or None for a NOT NULL column),
+    so it never reaches the driver.
+    """
+    if value is None:
+        if not column.nullable:
+            raise ValueError(f"{column.name} is required")
+        return value
+    python_type = column.type.python_type
+    if isinstance(value, python_type):
+        return value
+    try:
+        if python_type in (datetime, date) and isinstance(value, str):
+            return python_type.fromisoformat(value)
+        if python_type in (int, float, str) and isinstance(value, (int, float, str)):
+            coerced = python_type(value)
+            # int() would silently drop the fraction of a float
+            if not (python_type is int and isinstance(value, float) and coerced != value):
+                return coerced
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid value for {column.name}") from e
+    raise ValueError(f"Invalid value for {column.name}")
+
+
+def _coerce_key(column: Column, value: Any) -> Any:
+    python_type = column.type.python_type
+    try:
+        if python_type in (datetime, date):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor value for {column.name}") from e
+
+
+@lru_cache(maxsize=None)
+def _value_columns(domain_type: type) -> Tuple[Column, ...]:
+    """
+    Non primary key columns of a domain type, computed once per type.
+    """
+    return tuple(column for column in domain_type.__table__.columns if not column.primary_key)
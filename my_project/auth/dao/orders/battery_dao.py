@@ -1,15 +1,24 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 
-import sqlalchemy
+from sqlalchemy import select
 
 from my_project.auth.dao.general_dao import GeneralDAO
-from my_project.auth.domain import Battery
+from my_project.auth.domain import Battery, Station, Location
 
 
 class BatteryDAO(GeneralDAO):
     _domain_type = Battery
 
-    def get_batteries_after_station(self, station_id) -> List[Dict[str, Any]]:
-        result = self._session.execute(sqlalchemy.text("CALL get_batteries_after_station(:p1)"),
-                                       {'p1': station_id}).mappings().all()
-        return [dict(row) for row in result]
\ No newline at end of file
+    def get_batteries_after_station(self, station_id: int, limit: Optional[int] = None,
+                                    after: Optional[Sequence[Any]] = None,
+                                    fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        b, s, l = Battery.__table__, Station.__table__, Location.__table__
+        statement = select(
+            s.c.id.label('station_id'), b.c.id.label('battery_id'),
+            s.c.total_capacity.label('station_total_capacity'),
+            s.c.installation_date.label('station_installation_date'),
+            l.c.city.label('station_location_city'), l.c.street.label('station_location_street'),
+        ).select_from(b.join(s, b.c.station_id == s.c.id).join(l, s.c.location_id == l.c.id)) \
+            .where(b.c.station_id == station_id)
+        return self._find_related('get_batteries_after_station', (Battery, Station, Location), station_id,
+                                  statement, 'battery_id', limit, after, fields)
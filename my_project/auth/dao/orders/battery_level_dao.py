@@ -1,6 +1,22 @@
+from datetime import datetime
+from typing import List, Optional
+
 from my_project.auth.dao.general_dao import GeneralDAO
 from my_project.auth.domain import BatteryLevel
 
 
 class BatteryLevelDAO(GeneralDAO):
     _domain_type = BatteryLevel
+
+    def find_levels(self, battery_id: int, date_from: Optional[datetime], date_to: Optional[datetime],
+                    limit: int) -> List[BatteryLevel]:
+        """
+        Readings of one battery in [date_from, date_to) ordered by time, served by a range scan
+        on ix_battery_level_battery_id_date_time.
+        """
+        query = self._session.query(BatteryLevel).filter(BatteryLevel.battery_id == battery_id)
+        if date_from is not None:
+            query = query.filter(BatteryLevel.date_time >= date_from)
+        if date_to is not None:
+            query = query.filter(BatteryLevel.date_time < date_to)
+        return query.order_by(BatteryLevel.date_time).limit(limit).all()
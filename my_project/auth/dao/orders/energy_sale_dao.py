@@ -1,15 +1,148 @@
-from typing import List, Dict, Any
+from collections import defaultdict
+from datetime import date, datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 
-import sqlalchemy
+from sqlalchemy.dialects import mysql, sqlite
 
 from my_project.auth.dao.general_dao import GeneralDAO
-from my_project.auth.domain import EnergySale
+from my_project.auth.domain import EnergySale, EnergySaleRollup
+
+PERIODS = {
+    'daily': 'day',
+    'monthly': 'month',
+    'yearly': 'year',
+}
+SALE_COLUMNS = (EnergySale.station_id, EnergySale.date_time, EnergySale.energy_sold)
+
+# (station_id, date_time, energy_sold) of one sale
+Sale = Tuple[int, Any, float]
 
 
 class EnergySaleDAO(GeneralDAO):
+    """
+    Keeps energy_sale_rollup in step with energy_sale: every write applies its +/- deltas
+    to the (station, day), (station, month) and (station, year) totals in the same transaction.
+    """
     _domain_type = EnergySale
 
     def get_energy_sold(self, type: str) -> List[Dict[str, Any]]:
-        result = self._session.execute(sqlalchemy.text("CALL get_energy_sold(:p1)"),
-                                       {'p1': type}).mappings().all()
-        return [dict(row) for row in result]
+        """
+        Energy sold per station and period, read from the rollups. Raises ValueError for an unknown type.
+        """
+        if type not in PERIODS:
+            raise ValueError(f"Type must be one of {', '.join(PERIODS)}")
+        rollups = self._session.query(EnergySaleRollup) \
+            .filter(EnergySaleRollup.period == PERIODS[type], EnergySaleRollup.sales_count > 0) \
+            .order_by(EnergySaleRollup.station_id, EnergySaleRollup.period_start)
+        return [rollup.put_into_dto() for rollup in rollups]
+
+    def rebuild_rollups(self) -> int:
+        """
+        Recomputes all rollups from energy_sale, streaming the sales. Returns the number of rollup rows.
+        """
+        self._session.query(EnergySaleRollup).delete()
+        sales = self._session.query(*SALE_COLUMNS).yield_per(10000)
+        rows = _rollup_rows(_rollup_deltas(sales, 1))
+        if rows:
+            self._session.execute(EnergySaleRollup.__table__.insert(), rows)
+        self._session.commit()
+        return len(rows)
+
+    def create(self, obj: EnergySale) -> EnergySale:
+        self._coerce_object(obj)
+        self._apply_deltas(_rollup_deltas([_sale_of(obj)], 1))
+        return super().create(obj)
+
+    def create_all(self, obj_list: List[EnergySale], return_ids: bool = False) -> List[int]:
+        for obj in obj_list:
+            self._coerce_object(obj)
+        self._apply_deltas(_rollup_deltas([_sale_of(obj) for obj in obj_list], 1))
+        return super().create_all(obj_list, return_ids)
+
+    def update(self, key: int, in_obj: EnergySale) -> bool:
+        self._coerce_object(in_obj)
+        old_sale = self._locked_sale(key)
+        if old_sale is None:
+            return False
+        self._apply_deltas(_rollup_deltas([old_sale], -1, _rollup_deltas([_sale_of(in_obj)], 1)))
+        return super().update(key, in_obj)
+
+    def patch(self, key: int, value_dict: Dict[str, object]) -> bool:
+        self._check_patch_fields(value_dict)
+        value_dict = self._coerce_values(value_dict)
+        old_sale = self._locked_sale(key)
+        if old_sale is None:
+            return False
+        new_sale = tuple(value_dict.get(column.key, old) for column, old in zip(SALE_COLUMNS, old_sale))
+        self._apply_deltas(_rollup_deltas([old_sale], -1, _rollup_deltas([new_sale], 1)))
+        return super().patch(key, value_dict)
+
+    def delete(self, key: int) -> bool:
+        old_sale = self._locked_sale(key)
+        if old_sale is None:
+            return False
+        self._apply_deltas(_rollup_deltas([old_sale], -1))
+        return super().delete(key)
+
+    def delete_all(self) -> None:
+        self._session.query(EnergySaleRollup).delete()
+        super().delete_all()
+
+    def _locked_sale(self, key: int) -> Optional[Sale]:
+        return self._session.query(*SALE_COLUMNS).filter(EnergySale.id == key).with_for_update().one_or_none()
+
+    def _apply_deltas(self, deltas: Dict[Tuple[str, int, date], List[float]]) -> None:
+        """
+        Adds the deltas to the rollups with one executemany upsert, without committing.
+        """
+        rows = _rollup_rows(deltas)
+        if not rows:
+            return
+        table = EnergySaleRollup.__table__
+        if self._session.get_bind().dialect.name == 'sqlite':
+            statement = sqlite.insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.period, table.c.station_id, table.c.period_start],
+                set_={'energy_sold': table.c.energy_sold + statement.excluded.energy_sold,
+                      'sales_count': table.c.sales_count + statement.excluded.sales_count})
+        else:
+            statement = mysql.insert(table)
+            statement = statement.on_duplicate_key_update(
+                energy_sold=table.c.energy_sold + statement.inserted.energy_sold,
+                sales_count=table.c.sales_count + statement.inserted.sales_count)
+        self._session.execute(statement, rows)
+
+
+def _sale_of(obj: EnergySale) -> Sale:
+    return obj.station_id, obj.date_time, obj.energy_sold
+
+
+def _rollup_deltas(sales: Iterable[Sale], sign: int,
+                   deltas: Optional[Dict[Tuple[str, int, date], List[float]]] = None
+                   ) -> Dict[Tuple[str, int, date], List[float]]:
+    """
+    Accumulates [energy_sold, sales_count] deltas per (period, station_id, period_start).
+    """
+    deltas = deltas if deltas is not None else defaultdict(lambda: [0.0, 0])
+    for station_id, date_time, energy_sold in sales:
+        if station_id is None or date_time is None or energy_sold is None:
+            continue  # the write itself is rejected by the NOT NULL constraints
+        if isinstance(date_time, str):
+            date_time = datetime.fromisoformat(date_time)
+        day = date_time.date() if isinstance(date_time, datetime) else date_time
+        for period, period_start in (('day', day),
+                                     ('month', day.replace(day=1)),
+                                     ('year', day.replace(month=1, day=1))):
+            delta = deltas[(period, station_id, period_start)]
+            delta[0] += sign * float(energy_sold)
+            delta[1] += sign
+    return deltas
+
+
+def _rollup_rows(deltas: Dict[Tuple[str, int, date], List[float]]) -> List[Dict[str, object]]:
+    return [
+        {'period': period, 'station_id': station_id, 'period_start': period_start,
+         'energy_sold': energy_sold, 'sales_count': sales_count}
+        for (period, station_id, period_start), (energy_sold, sales_count) in deltas.items()
+        if energy_sold or sales_count
+    ]
@@ -1,4 +1,4 @@
-import sqlalchemy
+from typing import Optional
 
 from my_project.auth.dao.general_dao import GeneralDAO
 from my_project.auth.domain import Location
@@ -7,10 +7,5 @@ from my_project.auth.domain import Location
 class LocationDAO(GeneralDAO):
     _domain_type = Location
 
-    def insert_location(self, city: str, street: str):
-        result = self._session.execute(
-            sqlalchemy.text("CALL insert_location(:city, :street)"),
-            {"city": city, "street": street}
-        )
-        self._session.commit()
-        return result
+    def insert_location(self, city: str, street: str) -> Optional[Location]:
+        return self._call_insert('insert_location', city=city, street=street)
@@ -1,28 +1,40 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 
-import sqlalchemy
+from sqlalchemy import select
 
 from my_project.auth.dao.general_dao import GeneralDAO
-from my_project.auth.domain import OwnerHasStation
+from my_project.auth.domain import OwnerHasStation, Owner, Station, Location
 
 
 class OwnerHasStationDAO(GeneralDAO):
     _domain_type = OwnerHasStation
 
-    def get_owners_after_station(self, station_id: int) -> List[Dict[str, Any]]:
-        result = self._session.execute(sqlalchemy.text("CALL get_owners_after_station(:p1)"),
-                                       {'p1': station_id}).mappings().all()
-        return [dict(row) for row in result]
+    def get_owners_after_station(self, station_id: int, limit: Optional[int] = None,
+                                 after: Optional[Sequence[Any]] = None,
+                                 fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        o, ohs = Owner.__table__, OwnerHasStation.__table__
+        statement = select(
+            ohs.c.id.label('id'), ohs.c.station_id, ohs.c.owner_id, o.c.name.label('owner_name'),
+            o.c.surname.label('owner_surname'), o.c.contact_number.label('owner_contact_number'),
+        ).select_from(o.join(ohs, o.c.id == ohs.c.owner_id)).where(ohs.c.station_id == station_id)
+        return self._find_related('get_owners_after_station', (OwnerHasStation, Owner), station_id,
+                                  statement, 'id', limit, after, fields)
 
-    def get_stations_after_owner(self, owner_id: int) -> List[Dict[str, Any]]:
-        result = self._session.execute(sqlalchemy.text("CALL get_stations_after_owner(:p1)"),
-                                       {'p1': owner_id}).mappings().all()
-        return [dict(row) for row in result]
+    def get_stations_after_owner(self, owner_id: int, limit: Optional[int] = None,
+                                 after: Optional[Sequence[Any]] = None,
+                                 fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        s, ohs, l = Station.__table__, OwnerHasStation.__table__, Location.__table__
+        statement = select(
+            ohs.c.id.label('id'), ohs.c.station_id, ohs.c.owner_id,
+            s.c.total_capacity.label('station_total_capacity'),
+            s.c.installation_date.label('station_installation_date'),
+            l.c.city.label('station_location_city'), l.c.street.label('station_location_street'),
+        ).select_from(s.join(ohs, s.c.id == ohs.c.station_id).join(l, s.c.location_id == l.c.id)) \
+            .where(ohs.c.owner_id == owner_id)
+        return self._find_related('get_stations_after_owner', (OwnerHasStation, Station, Location), owner_id,
+                                  statement, 'id', limit, after, fields)
 
-    def insert_owner_has_station(self, owner_id: int, station_id: int, ownership_percentage: float):
-        result = self._session.execute(
-            sqlalchemy.text("CALL insert_owner_has_station(:owner_id, :station_id, :ownership_percentage)"),
-            {"owner_id": owner_id, "station_id": station_id, "ownership_percentage": ownership_percentage}
-        )
-        self._session.commit()
-        return result
+    def insert_owner_has_station(self, owner_id: int, station_id: int,
+                                 ownership_percentage: float) -> Optional[OwnerHasStation]:
+        return self._call_insert('insert_owner_has_station', owner_id=owner_id, station_id=station_id,
+                                 ownership_percentage=ownership_percentage)
@@ -1,6 +1,51 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Sequence
+
+from sqlalchemy import func, cast, literal_column, Integer
+
 from my_project.auth.dao.general_dao import GeneralDAO
 from my_project.auth.domain import PanelProduction
 
+AGGREGATES = {
+    'sum': func.sum,
+    'avg': func.avg,
+    'min': func.min,
+    'max': func.max,
+}
+EPOCH = datetime(1970, 1, 1)
+
 
 class PanelProductionDAO(GeneralDAO):
     _domain_type = PanelProduction
+
+    def aggregate_production(self, solar_panel_id: int, date_from: Optional[datetime], date_to: Optional[datetime],
+                             bucket_seconds: int, aggregates: Sequence[str], limit: int) -> List[Dict[str, object]]:
+        """
+        Production of one panel in [date_from, date_to) grouped into `bucket_seconds` wide time buckets,
+        with the requested aggregates computed in SQL. Returns at most `limit` buckets ordered by time.
+        """
+        bucket = self._bucket_start(bucket_seconds).label('bucket_start')
+        columns = [AGGREGATES[name](PanelProduction.production).label(name) for name in aggregates]
+        query = self._session.query(bucket, *columns).filter(PanelProduction.solar_panel_id == solar_panel_id)
+        if date_from is not None:
+            query = query.filter(PanelProduction.date_time >= date_from)
+        if date_to is not None:
+            query = query.filter(PanelProduction.date_time < date_to)
+        rows = query.group_by(bucket).order_by(bucket).limit(limit).all()
+        return [
+            {'bucket_start': EPOCH + timedelta(seconds=int(row.bucket_start)),
+             **{name: getattr(row, name) for name in aggregates}}
+            for row in rows
+        ]
+
+    def _bucket_start(self, bucket_seconds: int):
+        """
+        Seconds since 1970-01-01 of the bucket a reading falls into, in the stored (naive) time.
+        """
+        # literals instead of bind parameters keep the SELECT and GROUP BY expressions identical for MySQL
+        date_time = PanelProduction.date_time
+        width = literal_column(str(int(bucket_seconds)))
+        if self._session.get_bind().dialect.name == 'sqlite':
+            return cast(func.strftime('%s', date_time), Integer) / width * width
+        seconds = func.timestampdiff(literal_column('SECOND'), literal_column("'1970-01-01 00:00:00'"), date_time)
+        return func.floor(seconds / width) * width
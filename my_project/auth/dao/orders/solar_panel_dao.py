@@ -1,20 +1,35 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 
-import sqlalchemy
+from sqlalchemy import select
 
 from my_project.auth.dao.general_dao import GeneralDAO
-from my_project.auth.domain import SolarPanel
+from my_project.auth.domain import SolarPanel, PanelType, Station, Location
 
 
 class SolarPanelDAO(GeneralDAO):
     _domain_type = SolarPanel
 
-    def get_solar_panels_after_panel_type(self, panel_type_id: int) -> List[Dict[str, Any]]:
-        result = self._session.execute(sqlalchemy.text("CALL get_solar_panels_after_panel_type(:p1)"),
-                                       {'p1': panel_type_id}).mappings().all()
-        return [dict(row) for row in result]
+    def get_solar_panels_after_panel_type(self, panel_type_id: int, limit: Optional[int] = None,
+                                          after: Optional[Sequence[Any]] = None,
+                                          fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        sp, pt = SolarPanel.__table__, PanelType.__table__
+        statement = select(
+            pt.c.id.label('panel_type_id'), sp.c.id.label('solar_panel_id'),
+            pt.c.type_name.label('panel_type_name'), pt.c.description.label('panel_type_description'),
+        ).select_from(sp.join(pt, sp.c.panel_type_id == pt.c.id)).where(sp.c.panel_type_id == panel_type_id)
+        return self._find_related('get_solar_panels_after_panel_type', (SolarPanel, PanelType), panel_type_id,
+                                  statement, 'solar_panel_id', limit, after, fields)
 
-    def get_solar_panels_after_station(self, station_id: int) -> List[Dict[str, Any]]:
-        result = self._session.execute(sqlalchemy.text("CALL get_solar_panels_after_station(:p1)"),
-                                       {'p1': station_id}).mappings().all()
-        return [dict(row) for row in result]
+    def get_solar_panels_after_station(self, station_id: int, limit: Optional[int] = None,
+                                       after: Optional[Sequence[Any]] = None,
+                                       fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        sp, s, l = SolarPanel.__table__, Station.__table__, Location.__table__
+        statement = select(
+            s.c.id.label('station_id'), sp.c.id.label('solar_panel_id'),
+            s.c.total_capacity.label('station_total_capacity'),
+            s.c.installation_date.label('station_installation_date'),
+            l.c.city.label('station_location_city'), l.c.street.label('station_location_street'),
+        ).select_from(sp.join(s, sp.c.station_id == s.c.id).join(l, s.c.location_id == l.c.id)) \
+            .where(sp.c.station_id == station_id)
+        return self._find_related('get_solar_panels_after_station', (SolarPanel, Station, Location), station_id,
+                                  statement, 'solar_panel_id', limit, after, fields)
@@ -4,6 +4,7 @@ from .orders.panel_type import PanelType
 from .orders.station import Station
 from .orders.owner_has_station import OwnerHasStation
 from .orders.energy_sale import EnergySale
+from .orders.energy_sale_rollup import EnergySaleRollup
 from .orders.battery import Battery
 from .orders.battery_level import BatteryLevel
 from .orders.solar_panel import SolarPanel
@@ -1,5 +1,9 @@
 from abc import abstractmethod
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Sequence
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import MANYTOONE
 
 
 class IDto:
@@ -13,3 +17,23 @@ class IDto:
     def create_from_dto(dto_dict: Dict[str, object]) -> object:
         """
         """
+
+    def put_into_dto_with(self, include: Sequence[str]) -> Dict[str, object]:
+        """
+        put_into_dto with the DTOs of the named related objects embedded (None where unset).
+        The relationships should be eagerly loaded, see `includable`.
+        """
+        dto = self.put_into_dto()
+        for name in include:
+            related = getattr(self, includable(type(self))[name])
+            dto[name] = None if related is None else related.put_into_dto()
+        return dto
+
+
+@lru_cache(maxsize=None)
+def includable(domain_type: type) -> Dict[str, str]:
+    """
+    Include names (lower-cased keys) of the many-to-one relationships of a domain type, mapped to the keys.
+    """
+    return {relationship.key.lower(): relationship.key
+            for relationship in inspect(domain_type).relationships if relationship.direction is MANYTOONE}
@@ -3,6 +3,7 @@ from typing import Dict, Any
 
 from my_project import db
 from my_project.auth.domain.i_dto import IDto
+from my_project.auth.domain.types import IsoDate
 
 
 class Battery(db.Model, IDto):
@@ -11,7 +12,7 @@ class Battery(db.Model, IDto):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     capacity = db.Column(db.String(45), nullable=False)
-    installation_date = db.Column(db.Date, nullable=False)
+    installation_date = db.Column(IsoDate, nullable=False)
     station_id = db.Column(db.Integer, db.ForeignKey('station.id'), nullable=False)
     station = db.relationship('Station', backref='batteries')
 
@@ -3,14 +3,19 @@ from typing import Dict, Any
 
 from my_project import db
 from my_project.auth.domain.i_dto import IDto
+from my_project.auth.domain.types import IsoDateTime
 
 
 class BatteryLevel(db.Model, IDto):
 
     __tablename__ = 'battery_level'
+    __table_args__ = (
+        db.Index('ix_battery_level_battery_id_date_time', 'battery_id', 'date_time'),
+        db.Index('ix_battery_level_date_time_id', 'date_time', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
-    date_time = db.Column(db.DateTime, nullable=False)
+    date_time = db.Column(IsoDateTime, nullable=False)
     charge_level = db.Column(db.Float, nullable=False)
     battery_id = db.Column(db.Integer, db.ForeignKey('battery.id'), nullable=False)
     battery = db.relationship('Battery', backref='battery_levels')
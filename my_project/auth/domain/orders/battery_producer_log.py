@@ -3,6 +3,7 @@ from typing import Dict, Any
 
 from my_project import db
 from my_project.auth.domain.i_dto import IDto
+from my_project.auth.domain.types import IsoDateTime
 
 
 class BatteryProducerLog(db.Model, IDto):
@@ -12,7 +13,7 @@ class BatteryProducerLog(db.Model, IDto):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     battery_id = db.Column(db.Integer, nullable=False)
     name = db.Column(db.String(100), nullable=False)
-    deleted_at = db.Column(db.DateTime, nullable=False)
+    deleted_at = db.Column(IsoDateTime, nullable=False)
 
     def __repr__(self) -> str:
         return f"Battery {self.id} {self.battery_id} {self.name}, {self.deleted_at}"
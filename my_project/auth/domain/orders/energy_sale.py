@@ -3,16 +3,20 @@ from typing import Dict, Any
 
 from my_project import db
 from my_project.auth.domain.i_dto import IDto
+from my_project.auth.domain.types import IsoDateTime
 
 
 class EnergySale(db.Model, IDto):
 
     __tablename__ = 'energy_sale'
+    __table_args__ = (
+        db.Index('ix_energy_sale_date_time_id', 'date_time', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     energy_sold = db.Column(db.Float, nullable=False)
     price_per_kwh = db.Column(db.Float, nullable=False)
-    date_time = db.Column(db.DateTime, nullable=False)
+    date_time = db.Column(IsoDateTime, nullable=False)
     station_id = db.Column(db.Integer, db.ForeignKey('station.id'), nullable=False)
     station = db.relationship('Station', backref='energy_sales')
 
@@ -0,0 +1,36 @@
+from __future__ import annotations
+from typing import Dict, Any
+
+from my_project import db
+from my_project.auth.domain.i_dto import IDto
+from my_project.auth.domain.types import IsoDate
+
+
+class EnergySaleRollup(db.Model, IDto):
+    """
+    Energy sold by a station per day, month or year, maintained by EnergySaleDAO on every sale write.
+    """
+
+    __tablename__ = 'energy_sale_rollup'
+
+    period = db.Column(db.String(5), primary_key=True)
+    station_id = db.Column(db.Integer, primary_key=True)
+    period_start = db.Column(IsoDate, primary_key=True)
+    energy_sold = db.Column(db.Float, nullable=False)
+    sales_count = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"EnergySaleRollup {self.period} {self.station_id} {self.period_start}, {self.energy_sold}"
+
+    def put_into_dto(self) -> Dict[str, object]:
+        return {
+            'station_id': self.station_id,
+            'period_start': self.period_start,
+            'energy_sold': self.energy_sold,
+            'sales_count': self.sales_count,
+        }
+
+    @staticmethod
+    def create_from_dto(dto_dict: Dict[str, Any]) -> EnergySaleRollup:
+        obj = EnergySaleRollup(**dto_dict)
+        return obj
@@ -3,14 +3,18 @@ from typing import Dict, Any
 
 from my_project import db
 from my_project.auth.domain.i_dto import IDto
+from my_project.auth.domain.types import IsoDateTime
 
 
 class PanelAngle(db.Model, IDto):
 
     __tablename__ = 'panel_angle'
+    __table_args__ = (
+        db.Index('ix_panel_angle_date_time_id', 'date_time', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
-    date_time = db.Column(db.DateTime, nullable=False)
+    date_time = db.Column(IsoDateTime, nullable=False)
     angle = db.Column(db.Float, nullable=False)
     solar_panel_id = db.Column(db.Integer, db.ForeignKey('solar_panel.id'), nullable=False)
     solar_panel = db.relationship('SolarPanel', backref='panel_angles')
@@ -3,6 +3,7 @@ from typing import Dict, Any
 
 from my_project import db
 from my_project.auth.domain.i_dto import IDto
+from my_project.auth.domain.types import IsoDate
 
 
 class SolarPanel(db.Model, IDto):
@@ -10,7 +11,7 @@ class SolarPanel(db.Model, IDto):
     __tablename__ = 'solar_panel'
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
-    installation_date = db.Column(db.Date, nullable=False)
+    installation_date = db.Column(IsoDate, nullable=False)
     panel_type_id = db.Column(db.Integer, db.ForeignKey('panel_type.id'), nullable=False)
     panel_type = db.relationship('PanelType', backref='panels')
     station_id = db.Column(db.Integer, db.ForeignKey('station.id'), nullable=False)
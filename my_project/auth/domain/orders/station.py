@@ -3,6 +3,7 @@ from typing import Dict, Any
 
 from my_project import db
 from my_project.auth.domain.i_dto import IDto
+from my_project.auth.domain.types import IsoDate
 
 
 class Station(db.Model, IDto):
@@ -11,7 +12,7 @@ class Station(db.Model, IDto):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True, nullable=False)
     total_capacity = db.Column(db.Float, nullable=False)
-    installation_date = db.Column(db.Date, nullable=False)
+    installation_date = db.Column(IsoDate, nullable=False)
     location_id = db.Column(db.Integer, db.ForeignKey('location.id'), nullable=False)
     location = db.relationship('Location', backref='stations')
 
@@ -0,0 +1,38 @@
+from datetime import date, datetime
+from typing import Any, Optional
+
+from sqlalchemy.types import TypeDecorator, Date, DateTime
+
+
+class IsoDate(TypeDecorator):
+    """
+    Date column that also accepts ISO-8601 strings as they come in JSON bodies.
+    """
+    impl = Date
+    cache_ok = True
+
+    @property
+    def python_type(self) -> type:
+        return date
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Optional[date]:
+        if isinstance(value, str):
+            return date.fromisoformat(value)
+        return value
+
+
+class IsoDateTime(TypeDecorator):
+    """
+    DateTime column that also accepts ISO-8601 strings as they come in JSON bodies.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    @property
+    def python_type(self) -> type:
+        return datetime
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Optional[datetime]:
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+        return value
@@ -7,6 +7,9 @@ def register_routes(app: Flask) -> None:
 
     app.register_blueprint(err_handler_bp)
 
+    from .stats_route import stats_bp
+    app.register_blueprint(stats_bp)
+
     from .orders.battery_route import battery_bp
     from .orders.battery_level_route import battery_level_bp
     from .orders.energy_sale_route import energy_sale_bp
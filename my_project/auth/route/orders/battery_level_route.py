@@ -3,6 +3,7 @@ from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
 
 from my_project.auth.controller import battery_level_controller
+from my_project.auth.route.responses import find_all_response, find_by_id_response, create_all_response, mget_response
 from my_project.auth.domain import BatteryLevel
 
 battery_level_bp = Blueprint('battery_levels', __name__, url_prefix='/battery-levels')
@@ -15,11 +16,55 @@ def get_all_battery_levels() -> Response:
     ---
     tags:
       - BatteryLevel
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of battery
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: order_by
+        type: string
+        enum: [id, date_time]
+        required: false
+        description: Keyset to paginate by
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all battery levels
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering, fields or include
     """
-    return make_response(jsonify(battery_level_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(battery_level_controller)
 
 
 @battery_level_bp.post('')
@@ -61,6 +106,92 @@ def create_battery_level() -> Response:
     return make_response(jsonify(battery_level.put_into_dto()), HTTPStatus.CREATED)
 
 
+@battery_level_bp.post('/bulk')
+def create_battery_levels() -> Response:
+    """
+    Create many battery levels in one transaction
+    ---
+    tags:
+      - BatteryLevel
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: battery_levels
+        description: List of battery level data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              date_time:
+                type: string
+                format: date-time
+                description: Date and time of the battery level reading
+                example: "2023-01-05 10:00:00"
+              charge_level:
+                type: number
+                format: float
+                description: Battery charge level percentage
+                example: 75.00
+              battery_id:
+                type: integer
+                description: Battery ID
+                example: 1
+    responses:
+      201:
+        description: Battery levels created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of battery levels
+    """
+    return create_all_response(battery_level_controller, BatteryLevel)
+
+
+@battery_level_bp.post('/_mget')
+def get_battery_levels_by_ids() -> Response:
+    """
+    Get many battery levels by ID with one query
+    ---
+    tags:
+      - BatteryLevel
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of battery
+    responses:
+      200:
+        description: Found battery levels in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields or include
+    """
+    return mget_response(battery_level_controller)
+
+
 @battery_level_bp.get('/<int:battery_level_id>')
 def get_battery_level(battery_level_id: int) -> Response:
     """
@@ -74,13 +205,27 @@ def get_battery_level(battery_level_id: int) -> Response:
         type: integer
         required: true
         description: Battery level ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of battery
     responses:
       200:
         description: Battery level data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Battery level not found
+      422:
+        description: Unknown field or related object
     """
-    return make_response(jsonify(battery_level_controller.find_by_id(battery_level_id)), HTTPStatus.OK)
+    return find_by_id_response(battery_level_controller, battery_level_id)
 
 
 @battery_level_bp.put('/<int:battery_level_id>')
@@ -168,6 +313,8 @@ def patch_battery_level(battery_level_id: int) -> Response:
         description: Battery level updated successfully
       404:
         description: Battery level not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     battery_level_controller.patch(battery_level_id, content)
@@ -192,6 +339,8 @@ def delete_battery_level(battery_level_id: int) -> Response:
         description: Battery level deleted successfully
       404:
         description: Battery level not found
+      409:
+        description: Other objects still reference it
     """
     battery_level_controller.delete(battery_level_id)
     return make_response("BatteryLevel deleted", HTTPStatus.OK)
@@ -1,8 +1,11 @@
 from http import HTTPStatus
 
-from flask import Blueprint, jsonify, Response, request, make_response
+from flask import Blueprint, jsonify, Response, request, make_response, abort
 
-from my_project.auth.controller import battery_controller
+from my_project.auth.controller import battery_controller, battery_level_controller
+from my_project.auth.route.responses import (find_all_response, find_by_id_response, create_all_response, mget_response,
+                                             related_response)
+from my_project.auth.controller.orders.battery_level_controller import MAX_LEVELS_LIMIT
 from my_project.auth.domain import Battery
 
 battery_bp = Blueprint('batteries', __name__, url_prefix='/batteries')
@@ -15,11 +18,49 @@ def get_all_batteries() -> Response:
     ---
     tags:
       - Battery
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of station
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all batteries
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering, fields or include
     """
-    return make_response(jsonify(battery_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(battery_controller)
 
 
 @battery_bp.post('')
@@ -60,6 +101,91 @@ def create_battery() -> Response:
     return make_response(jsonify(battery.put_into_dto()), HTTPStatus.CREATED)
 
 
+@battery_bp.post('/bulk')
+def create_batteries() -> Response:
+    """
+    Create many batteries in one transaction
+    ---
+    tags:
+      - Battery
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: batteries
+        description: List of battery data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              capacity:
+                type: string
+                description: Battery capacity
+                example: "1000"
+              installation_date:
+                type: string
+                format: date
+                description: Installation date
+                example: "2022-01-05"
+              station_id:
+                type: integer
+                description: Station ID
+                example: 1
+    responses:
+      201:
+        description: Batteries created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of batteries
+    """
+    return create_all_response(battery_controller, Battery)
+
+
+@battery_bp.post('/_mget')
+def get_batteries_by_ids() -> Response:
+    """
+    Get many batteries by ID with one query
+    ---
+    tags:
+      - Battery
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of station
+    responses:
+      200:
+        description: Found batteries in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields or include
+    """
+    return mget_response(battery_controller)
+
+
 @battery_bp.get('/<int:battery_id>')
 def get_battery(battery_id: int) -> Response:
     """
@@ -73,13 +199,27 @@ def get_battery(battery_id: int) -> Response:
         type: integer
         required: true
         description: Battery ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of station
     responses:
       200:
         description: Battery data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Battery not found
+      422:
+        description: Unknown field or related object
     """
-    return make_response(jsonify(battery_controller.find_by_id(battery_id)), HTTPStatus.OK)
+    return find_by_id_response(battery_controller, battery_id)
 
 
 @battery_bp.put('/<int:battery_id>')
@@ -165,6 +305,8 @@ def patch_battery(battery_id: int) -> Response:
         description: Battery updated successfully
       404:
         description: Battery not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     battery_controller.patch(battery_id, content)
@@ -189,6 +331,8 @@ def delete_battery(battery_id: int) -> Response:
         description: Battery deleted successfully
       404:
         description: Battery not found
+      409:
+        description: Other objects still reference it
     """
     battery_controller.delete(battery_id)
     return make_response("Battery deleted", HTTPStatus.OK)
@@ -207,9 +351,71 @@ def get_batteries_after_station(station_id: int) -> Response:
         type: integer
         required: true
         description: Station ID
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (at most 1000); the response becomes {items, next}
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor from the previous page's next link
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (station_id, battery_id, station_total_capacity, station_installation_date, station_location_city, station_location_street); battery_id is always included
     responses:
       200:
         description: List of batteries for the specified station
+      422:
+        description: Invalid limit, cursor or fields
     """
-    return make_response(jsonify(battery_controller.get_batteries_after_station(station_id)), HTTPStatus.OK)
+    return related_response(battery_controller.get_batteries_after_station, station_id)
+
 
+@battery_bp.get('/<int:battery_id>/levels')
+def get_battery_levels(battery_id: int) -> Response:
+    """
+    Get charge level history of a battery in a time window
+    ---
+    tags:
+      - Battery
+    parameters:
+      - in: path
+        name: battery_id
+        type: integer
+        required: true
+        description: Battery ID
+      - in: query
+        name: from
+        type: string
+        format: date-time
+        required: false
+        description: Start of the window, inclusive
+        example: "2023-01-05 00:00:00"
+      - in: query
+        name: to
+        type: string
+        format: date-time
+        required: false
+        description: End of the window, exclusive
+        example: "2023-01-06 00:00:00"
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Maximum number of readings (default and max 10000)
+    responses:
+      200:
+        description: Readings ordered by date and time, at most `limit` (truncated is set if the window has more)
+      422:
+        description: Invalid window or limit
+    """
+    limit = request.args.get('limit', str(MAX_LEVELS_LIMIT))
+    if not limit.isdigit():
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    levels = battery_level_controller.find_levels(battery_id, request.args.get('from'), request.args.get('to'),
+                                                  int(limit))
+    return make_response(jsonify(levels), HTTPStatus.OK)
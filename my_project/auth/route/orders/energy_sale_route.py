@@ -3,6 +3,7 @@ from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
 
 from my_project.auth.controller import energy_sale_controller
+from my_project.auth.route.responses import find_all_response, find_by_id_response, create_all_response, mget_response
 from my_project.auth.domain import EnergySale
 
 energy_sale_bp = Blueprint('energy_sales', __name__, url_prefix='/energy-sales')
@@ -15,11 +16,55 @@ def get_all_energy_sales() -> Response:
     ---
     tags:
       - EnergySale
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of station
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: order_by
+        type: string
+        enum: [id, date_time]
+        required: false
+        description: Keyset to paginate by
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all energy sales
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering, fields or include
     """
-    return make_response(jsonify(energy_sale_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(energy_sale_controller)
 
 
 @energy_sale_bp.post('')
@@ -66,6 +111,97 @@ def create_energy_sale() -> Response:
     return make_response(jsonify(energy_sale.put_into_dto()), HTTPStatus.CREATED)
 
 
+@energy_sale_bp.post('/bulk')
+def create_energy_sales() -> Response:
+    """
+    Create many energy sales in one transaction
+    ---
+    tags:
+      - EnergySale
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: energy_sales
+        description: List of energy sale data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              energy_sold:
+                type: number
+                format: float
+                description: Amount of energy sold in kWh
+                example: 100.50
+              price_per_kwh:
+                type: number
+                format: float
+                description: Price per kWh
+                example: 0.15
+              date_time:
+                type: string
+                format: date-time
+                description: Date and time of the sale
+                example: "2023-01-01 10:00:00"
+              station_id:
+                type: integer
+                description: Station ID
+                example: 1
+    responses:
+      201:
+        description: Energy sales created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of energy sales
+    """
+    return create_all_response(energy_sale_controller, EnergySale)
+
+
+@energy_sale_bp.post('/_mget')
+def get_energy_sales_by_ids() -> Response:
+    """
+    Get many energy sales by ID with one query
+    ---
+    tags:
+      - EnergySale
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of station
+    responses:
+      200:
+        description: Found energy sales in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields or include
+    """
+    return mget_response(energy_sale_controller)
+
+
 @energy_sale_bp.get('/<int:energy_sale_id>')
 def get_energy_sale(energy_sale_id: int) -> Response:
     """
@@ -79,13 +215,27 @@ def get_energy_sale(energy_sale_id: int) -> Response:
         type: integer
         required: true
         description: Energy sale ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of station
     responses:
       200:
         description: Energy sale data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Energy sale not found
+      422:
+        description: Unknown field or related object
     """
-    return make_response(jsonify(energy_sale_controller.find_by_id(energy_sale_id)), HTTPStatus.OK)
+    return find_by_id_response(energy_sale_controller, energy_sale_id)
 
 
 @energy_sale_bp.put('/<int:energy_sale_id>')
@@ -183,6 +333,8 @@ def patch_energy_sale(energy_sale_id: int) -> Response:
         description: Energy sale updated successfully
       404:
         description: Energy sale not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     energy_sale_controller.patch(energy_sale_id, content)
@@ -207,6 +359,8 @@ def delete_energy_sale(energy_sale_id: int) -> Response:
         description: Energy sale deleted successfully
       404:
         description: Energy sale not found
+      409:
+        description: Other objects still reference it
     """
     energy_sale_controller.delete(energy_sale_id)
     return make_response("EnergySale deleted", HTTPStatus.OK)
@@ -223,10 +377,13 @@ def get_energy_sold(type: str) -> Response:
       - in: path
         name: type
         type: string
+        enum: [daily, monthly, yearly]
         required: true
-        description: Calculation type (e.g., 'daily', 'monthly', 'yearly')
+        description: Calculation type
     responses:
       200:
-        description: Calculated energy sold data
+        description: Energy sold and number of sales per station and day, month or year
+      422:
+        description: Unknown calculation type
     """
     return make_response(jsonify(energy_sale_controller.get_energy_sold(type)), HTTPStatus.OK)
\ No newline at end of file
@@ -1,8 +1,10 @@
 from http import HTTPStatus
 
-from flask import Blueprint, jsonify, Response, request, make_response
+from flask import Blueprint, jsonify, Response, request, make_response, url_for
 
 from my_project.auth.controller import location_controller
+from my_project.auth.route.responses import (find_all_response, find_by_id_response, create_all_response, mget_response,
+                                             query_flag)
 from my_project.auth.domain import Location
 
 location_bp = Blueprint('locations', __name__, url_prefix='/locations')
@@ -15,11 +17,44 @@ def get_all_locations() -> Response:
     ---
     tags:
       - Location
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all locations
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering or fields
     """
-    return make_response(jsonify(location_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(location_controller)
 
 
 @location_bp.post('')
@@ -30,6 +65,11 @@ def create_location() -> Response:
     tags:
       - Location
     parameters:
+      - in: query
+        name: return_all
+        type: boolean
+        required: false
+        description: Respond with the whole table instead of the new location (legacy behaviour)
       - in: body
         name: location
         description: Location data
@@ -47,13 +87,94 @@ def create_location() -> Response:
               example: "Shevchenka St."
     responses:
       201:
-        description: Location created successfully
+        description: Location created; the body is the new location and Location its URL
+      422:
+        description: The procedure inserted no row
     """
     content = request.get_json()
     city = content['city']
     street = content['street']
-    location_controller.insert_location(city, street)
-    return make_response(jsonify(location_controller.find_all()), HTTPStatus.CREATED)
+    dto = location_controller.insert_location(city, street)
+    if query_flag('return_all'):
+        return make_response(jsonify(location_controller.find_all()), HTTPStatus.CREATED)
+    response = make_response(jsonify(dto), HTTPStatus.CREATED)
+    response.headers['Location'] = url_for('.get_location', location_id=dto['id'])
+    return response
+
+
+@location_bp.post('/bulk')
+def create_locations() -> Response:
+    """
+    Create many locations in one transaction
+    ---
+    tags:
+      - Location
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: locations
+        description: List of location data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              city:
+                type: string
+                description: City name
+                example: "Kyiv"
+              street:
+                type: string
+                description: Street name
+                example: "Shevchenka St."
+    responses:
+      201:
+        description: Locations created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of locations
+    """
+    return create_all_response(location_controller, Location)
+
+
+@location_bp.post('/_mget')
+def get_locations_by_ids() -> Response:
+    """
+    Get many locations by ID with one query
+    ---
+    tags:
+      - Location
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+    responses:
+      200:
+        description: Found locations in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields
+    """
+    return mget_response(location_controller)
 
 
 @location_bp.get('/<int:location_id>')
@@ -69,13 +190,22 @@ def get_location(location_id: int) -> Response:
         type: integer
         required: true
         description: Location ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
     responses:
       200:
         description: Location data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Location not found
+      422:
+        description: Unknown field
     """
-    return make_response(jsonify(location_controller.find_by_id(location_id)), HTTPStatus.OK)
+    return find_by_id_response(location_controller, location_id)
 
 
 @location_bp.put('/<int:location_id>')
@@ -151,6 +281,8 @@ def patch_location(location_id: int) -> Response:
         description: Location updated successfully
       404:
         description: Location not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     location_controller.patch(location_id, content)
@@ -175,6 +307,8 @@ def delete_location(location_id: int) -> Response:
         description: Location deleted successfully
       404:
         description: Location not found
+      409:
+        description: Other objects still reference it
     """
     location_controller.delete(location_id)
     return make_response("Client deleted", HTTPStatus.OK)
@@ -1,8 +1,10 @@
 from http import HTTPStatus
 
-from flask import Blueprint, jsonify, Response, request, make_response
+from flask import Blueprint, jsonify, Response, request, make_response, url_for
 
 from my_project.auth.controller import owner_has_station_controller
+from my_project.auth.route.responses import (find_all_response, find_by_id_response, create_all_response, mget_response,
+                                             related_response, query_flag)
 from my_project.auth.domain import OwnerHasStation
 
 owner_has_station_bp = Blueprint('owner_has_stations', __name__, url_prefix='/owner-has-stations')
@@ -15,11 +17,49 @@ def get_all_owner_has_stations() -> Response:
     ---
     tags:
       - OwnerHasStation
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of owner, station
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all owner-station relationships
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering, fields or include
     """
-    return make_response(jsonify(owner_has_station_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(owner_has_station_controller)
 
 
 @owner_has_station_bp.post('')
@@ -30,6 +70,11 @@ def create_owner_has_station() -> Response:
     tags:
       - OwnerHasStation
     parameters:
+      - in: query
+        name: return_all
+        type: boolean
+        required: false
+        description: Respond with the whole table instead of the new relationship (legacy behaviour)
       - in: body
         name: owner_has_station
         description: Owner-station relationship data
@@ -51,15 +96,106 @@ def create_owner_has_station() -> Response:
               description: Ownership percentage
               example: 50.00
     responses:
-      200:
-        description: Owner-station relationship created successfully
+      201:
+        description: Owner-station relationship created; the body is the new relationship and Location its URL
+      422:
+        description: The procedure inserted no row
     """
     content = request.get_json()
     owner_id = content['owner_id']
     station_id = content['station_id']
     ownership_percentage = content['ownership_percentage']
-    owner_has_station_controller.insert_owner_has_station(owner_id, station_id, ownership_percentage)
-    return make_response(jsonify(owner_has_station_controller.find_all()), HTTPStatus.OK)
+    dto = owner_has_station_controller.insert_owner_has_station(owner_id, station_id, ownership_percentage)
+    if query_flag('return_all'):
+        return make_response(jsonify(owner_has_station_controller.find_all()), HTTPStatus.CREATED)
+    response = make_response(jsonify(dto), HTTPStatus.CREATED)
+    response.headers['Location'] = url_for('.get_owner_has_station', owner_has_station_id=dto['id'])
+    return response
+
+
+@owner_has_station_bp.post('/bulk')
+def create_owner_has_stations() -> Response:
+    """
+    Create many owner-station relationships in one transaction
+    ---
+    tags:
+      - OwnerHasStation
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: owner_has_stations
+        description: List of owner-station relationship data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              owner_id:
+                type: integer
+                description: Owner ID
+                example: 1
+              station_id:
+                type: integer
+                description: Station ID
+                example: 1
+              ownership_percentage:
+                type: number
+                format: float
+                description: Ownership percentage
+                example: 50.00
+    responses:
+      201:
+        description: Owner-station relationships created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of owner-station relationships
+    """
+    return create_all_response(owner_has_station_controller, OwnerHasStation)
+
+
+@owner_has_station_bp.post('/_mget')
+def get_owner_has_stations_by_ids() -> Response:
+    """
+    Get many owner-station relationships by ID with one query
+    ---
+    tags:
+      - OwnerHasStation
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of owner, station
+    responses:
+      200:
+        description: Found owner-station relationships in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields or include
+    """
+    return mget_response(owner_has_station_controller)
 
 
 @owner_has_station_bp.get('/<int:owner_has_station_id>')
@@ -75,13 +211,27 @@ def get_owner_has_station(owner_has_station_id: int) -> Response:
         type: integer
         required: true
         description: Owner-station relationship ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of owner, station
     responses:
       200:
         description: Owner-station relationship data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Owner-station relationship not found
+      422:
+        description: Unknown field or related object
     """
-    return make_response(jsonify(owner_has_station_controller.find_by_id(owner_has_station_id)), HTTPStatus.OK)
+    return find_by_id_response(owner_has_station_controller, owner_has_station_id)
 
 
 @owner_has_station_bp.put('/<int:owner_has_station_id>')
@@ -167,6 +317,8 @@ def patch_owner_has_station(owner_has_station_id: int) -> Response:
         description: Owner-station relationship updated successfully
       404:
         description: Owner-station relationship not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     owner_has_station_controller.patch(owner_has_station_id, content)
@@ -191,6 +343,8 @@ def delete_owner_has_station(owner_has_station_id: int) -> Response:
         description: Owner-station relationship deleted successfully
       404:
         description: Owner-station relationship not found
+      409:
+        description: Other objects still reference it
     """
     owner_has_station_controller.delete(owner_has_station_id)
     return make_response("OwnerHasStation deleted", HTTPStatus.OK)
@@ -209,12 +363,28 @@ def get_owners_after_station(station_id: int) -> Response:
         type: integer
         required: true
         description: Station ID
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (at most 1000); the response becomes {items, next}
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor from the previous page's next link
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id, station_id, owner_id, owner_name, owner_surname, owner_contact_number); id is always included
     responses:
       200:
         description: List of owners for the specified station
+      422:
+        description: Invalid limit, cursor or fields
     """
-    return make_response(jsonify(owner_has_station_controller.get_owners_after_station(station_id)),
-                         HTTPStatus.OK)
+    return related_response(owner_has_station_controller.get_owners_after_station, station_id)
 
 
 @owner_has_station_bp.get('/get-stations-after-owner/<int:owner_id>')
@@ -230,9 +400,25 @@ def get_stations_after_owner(owner_id: int) -> Response:
         type: integer
         required: true
         description: Owner ID
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (at most 1000); the response becomes {items, next}
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor from the previous page's next link
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id, station_id, owner_id, station_total_capacity, station_installation_date, station_location_city, station_location_street); id is always included
     responses:
       200:
         description: List of stations for the specified owner
+      422:
+        description: Invalid limit, cursor or fields
     """
-    return make_response(jsonify(owner_has_station_controller.get_stations_after_owner(owner_id)),
-                         HTTPStatus.OK)
+    return related_response(owner_has_station_controller.get_stations_after_owner, owner_id)
@@ -3,6 +3,7 @@ from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
 
 from my_project.auth.controller import owner_controller
+from my_project.auth.route.responses import find_all_response, find_by_id_response, create_all_response, mget_response
 from my_project.auth.domain import Owner
 
 owner_bp = Blueprint('owners', __name__, url_prefix='/owners')
@@ -15,11 +16,44 @@ def get_all_owners() -> Response:
     ---
     tags:
       - Owner
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all owners
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering or fields
     """
-    return make_response(jsonify(owner_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(owner_controller)
 
 
 @owner_bp.post('')
@@ -59,6 +93,85 @@ def create_owner() -> Response:
     return make_response(jsonify(owner.put_into_dto()), HTTPStatus.CREATED)
 
 
+@owner_bp.post('/bulk')
+def create_owners() -> Response:
+    """
+    Create many owners in one transaction
+    ---
+    tags:
+      - Owner
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: owners
+        description: List of owner data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              name:
+                type: string
+                description: Owner's first name
+                example: "John"
+              surname:
+                type: string
+                description: Owner's surname
+                example: "Doe"
+              contact_number:
+                type: integer
+                description: Contact phone number
+                example: 123456789
+    responses:
+      201:
+        description: Owners created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of owners
+    """
+    return create_all_response(owner_controller, Owner)
+
+
+@owner_bp.post('/_mget')
+def get_owners_by_ids() -> Response:
+    """
+    Get many owners by ID with one query
+    ---
+    tags:
+      - Owner
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+    responses:
+      200:
+        description: Found owners in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields
+    """
+    return mget_response(owner_controller)
+
+
 @owner_bp.get('/<int:owner_id>')
 def get_owner(owner_id: int) -> Response:
     """
@@ -72,13 +185,22 @@ def get_owner(owner_id: int) -> Response:
         type: integer
         required: true
         description: Owner ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
     responses:
       200:
         description: Owner data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Owner not found
+      422:
+        description: Unknown field
     """
-    return make_response(jsonify(owner_controller.find_by_id(owner_id)), HTTPStatus.OK)
+    return find_by_id_response(owner_controller, owner_id)
 
 
 @owner_bp.put('/<int:owner_id>')
@@ -162,6 +284,8 @@ def patch_owner(owner_id: int) -> Response:
         description: Owner updated successfully
       404:
         description: Owner not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     owner_controller.patch(owner_id, content)
@@ -186,6 +310,8 @@ def delete_owner(owner_id: int) -> Response:
         description: Owner deleted successfully
       404:
         description: Owner not found
+      409:
+        description: Other objects still reference it
     """
     owner_controller.delete(owner_id)
     return make_response("Owner deleted", HTTPStatus.OK)
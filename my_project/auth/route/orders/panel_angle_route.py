@@ -3,6 +3,7 @@ from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
 
 from my_project.auth.controller import panel_angle_controller
+from my_project.auth.route.responses import find_all_response, find_by_id_response, create_all_response, mget_response
 from my_project.auth.domain import PanelAngle
 
 panel_angle_bp = Blueprint('panel_angles', __name__, url_prefix='/panel-angles')
@@ -15,11 +16,55 @@ def get_all_panel_angles() -> Response:
     ---
     tags:
       - PanelAngle
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of solar_panel
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: order_by
+        type: string
+        enum: [id, date_time]
+        required: false
+        description: Keyset to paginate by
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all panel angles
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering, fields or include
     """
-    return make_response(jsonify(panel_angle_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(panel_angle_controller)
 
 
 @panel_angle_bp.post('')
@@ -61,6 +106,92 @@ def create_panel_angle() -> Response:
     return make_response(jsonify(panel_angle.put_into_dto()), HTTPStatus.CREATED)
 
 
+@panel_angle_bp.post('/bulk')
+def create_panel_angles() -> Response:
+    """
+    Create many panel angles in one transaction
+    ---
+    tags:
+      - PanelAngle
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: panel_angles
+        description: List of panel angle data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              date_time:
+                type: string
+                format: date-time
+                description: Date and time of the angle reading
+                example: "2022-01-01 10:00:00"
+              angle:
+                type: number
+                format: float
+                description: Panel angle in degrees
+                example: 45.00
+              solar_panel_id:
+                type: integer
+                description: Solar panel ID
+                example: 1
+    responses:
+      201:
+        description: Panel angles created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of panel angles
+    """
+    return create_all_response(panel_angle_controller, PanelAngle)
+
+
+@panel_angle_bp.post('/_mget')
+def get_panel_angles_by_ids() -> Response:
+    """
+    Get many panel angles by ID with one query
+    ---
+    tags:
+      - PanelAngle
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of solar_panel
+    responses:
+      200:
+        description: Found panel angles in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields or include
+    """
+    return mget_response(panel_angle_controller)
+
+
 @panel_angle_bp.get('/<int:panel_angle_id>')
 def get_panel_angle(panel_angle_id: int) -> Response:
     """
@@ -74,17 +205,31 @@ def get_panel_angle(panel_angle_id: int) -> Response:
         type: integer
         required: true
         description: Panel angle ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of solar_panel
     responses:
       200:
         description: Panel angle data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Panel angle not found
+      422:
+        description: Unknown field or related object
     """
-    return make_response(jsonify(panel_angle_controller.find_by_id(panel_angle_id)), HTTPStatus.OK)
+    return find_by_id_response(panel_angle_controller, panel_angle_id)
 
 
 @panel_angle_bp.put('/<int:panel_angle_id>')
-def update_panel_angle(panel_type_id: int) -> Response:
+def update_panel_angle(panel_angle_id: int) -> Response:
     """
     Update panel angle by ID
     ---
@@ -125,7 +270,7 @@ def update_panel_angle(panel_type_id: int) -> Response:
     """
     content = request.get_json()
     panel_angle = PanelAngle.create_from_dto(content)
-    panel_angle_controller.update(panel_type_id, panel_angle)
+    panel_angle_controller.update(panel_angle_id, panel_angle)
     return make_response("PanelAngle updated", HTTPStatus.OK)
 
 
@@ -168,6 +313,8 @@ def patch_panel_angle(panel_angle_id: int) -> Response:
         description: Panel angle updated successfully
       404:
         description: Panel angle not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     panel_angle_controller.patch(panel_angle_id, content)
@@ -192,6 +339,8 @@ def delete_panel_types(panel_angle_id: int) -> Response:
         description: Panel angle deleted successfully
       404:
         description: Panel angle not found
+      409:
+        description: Other objects still reference it
     """
     panel_angle_controller.delete(panel_angle_id)
     return make_response("PanelAngle deleted", HTTPStatus.OK)
@@ -3,6 +3,7 @@ from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
 
 from my_project.auth.controller import panel_production_controller
+from my_project.auth.route.responses import find_all_response, find_by_id_response, create_all_response, mget_response
 from my_project.auth.domain import PanelProduction
 
 panel_production_bp = Blueprint('panel_productions', __name__, url_prefix='/panel-productions')
@@ -15,11 +16,55 @@ def get_all_panel_productions() -> Response:
     ---
     tags:
       - PanelProduction
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of solar_panel
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: order_by
+        type: string
+        enum: [id, date_time]
+        required: false
+        description: Keyset to paginate by
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all panel productions
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering, fields or include
     """
-    return make_response(jsonify(panel_production_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(panel_production_controller)
 
 
 @panel_production_bp.post('')
@@ -61,6 +106,92 @@ def create_panel_production() -> Response:
     return make_response(jsonify(panel_production.put_into_dto()), HTTPStatus.CREATED)
 
 
+@panel_production_bp.post('/bulk')
+def create_panel_productions() -> Response:
+    """
+    Create many panel productions in one transaction
+    ---
+    tags:
+      - PanelProduction
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: panel_productions
+        description: List of panel production data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              date_time:
+                type: string
+                format: date-time
+                description: Date and time of the production reading
+                example: "2022-01-01 10:00:00"
+              production:
+                type: number
+                format: float
+                description: Energy production in kWh
+                example: 500.00
+              solar_panel_id:
+                type: integer
+                description: Solar panel ID
+                example: 1
+    responses:
+      201:
+        description: Panel productions created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of panel productions
+    """
+    return create_all_response(panel_production_controller, PanelProduction)
+
+
+@panel_production_bp.post('/_mget')
+def get_panel_productions_by_ids() -> Response:
+    """
+    Get many panel productions by ID with one query
+    ---
+    tags:
+      - PanelProduction
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of solar_panel
+    responses:
+      200:
+        description: Found panel productions in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields or include
+    """
+    return mget_response(panel_production_controller)
+
+
 @panel_production_bp.get('/<int:panel_production_id>')
 def get_panel_production(panel_production_id: int) -> Response:
     """
@@ -74,13 +205,27 @@ def get_panel_production(panel_production_id: int) -> Response:
         type: integer
         required: true
         description: Panel production ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of solar_panel
     responses:
       200:
         description: Panel production data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Panel production not found
+      422:
+        description: Unknown field or related object
     """
-    return make_response(jsonify(panel_production_controller.find_by_id(panel_production_id)), HTTPStatus.OK)
+    return find_by_id_response(panel_production_controller, panel_production_id)
 
 
 @panel_production_bp.put('/<int:panel_production_id>')
@@ -168,6 +313,8 @@ def patch_panel_production(panel_production_id: int) -> Response:
         description: Panel production updated successfully
       404:
         description: Panel production not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     panel_production_controller.patch(panel_production_id, content)
@@ -192,6 +339,8 @@ def delete_panel_types(panel_production_id: int) -> Response:
         description: Panel production deleted successfully
       404:
         description: Panel production not found
+      409:
+        description: Other objects still reference it
     """
     panel_production_controller.delete(panel_production_id)
     return make_response("PanelProduction deleted", HTTPStatus.OK)
@@ -3,6 +3,7 @@ from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
 
 from my_project.auth.controller import panel_type_controller
+from my_project.auth.route.responses import find_all_response, find_by_id_response, create_all_response, mget_response
 from my_project.auth.domain import PanelType
 
 panel_type_bp = Blueprint('panel_types', __name__, url_prefix='/panel-types')
@@ -15,11 +16,44 @@ def get_all_panel_types() -> Response:
     ---
     tags:
       - PanelType
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all panel types
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering or fields
     """
-    return make_response(jsonify(panel_type_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(panel_type_controller)
 
 
 @panel_type_bp.post('')
@@ -55,6 +89,81 @@ def create_panel_type() -> Response:
     return make_response(jsonify(panel_type.put_into_dto()), HTTPStatus.CREATED)
 
 
+@panel_type_bp.post('/bulk')
+def create_panel_types() -> Response:
+    """
+    Create many panel types in one transaction
+    ---
+    tags:
+      - PanelType
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: panel_types
+        description: List of panel type data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              type_name:
+                type: string
+                description: Panel type name
+                example: "Monocrystalline"
+              description:
+                type: string
+                description: Panel type description
+                example: "High efficiency and longevity"
+    responses:
+      201:
+        description: Panel types created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of panel types
+    """
+    return create_all_response(panel_type_controller, PanelType)
+
+
+@panel_type_bp.post('/_mget')
+def get_panel_types_by_ids() -> Response:
+    """
+    Get many panel types by ID with one query
+    ---
+    tags:
+      - PanelType
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+    responses:
+      200:
+        description: Found panel types in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields
+    """
+    return mget_response(panel_type_controller)
+
+
 @panel_type_bp.get('/<int:panel_type_id>')
 def get_panel_type(panel_type_id: int) -> Response:
     """
@@ -68,13 +177,22 @@ def get_panel_type(panel_type_id: int) -> Response:
         type: integer
         required: true
         description: Panel type ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
     responses:
       200:
         description: Panel type data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Panel type not found
+      422:
+        description: Unknown field
     """
-    return make_response(jsonify(panel_type_controller.find_by_id(panel_type_id)), HTTPStatus.OK)
+    return find_by_id_response(panel_type_controller, panel_type_id)
 
 
 @panel_type_bp.put('/<int:panel_type_id>')
@@ -150,6 +268,8 @@ def patch_panel_type(panel_type_id: int) -> Response:
         description: Panel type updated successfully
       404:
         description: Panel type not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     panel_type_controller.patch(panel_type_id, content)
@@ -174,6 +294,8 @@ def delete_panel_type(panel_type_id: int) -> Response:
         description: Panel type deleted successfully
       404:
         description: Panel type not found
+      409:
+        description: Other objects still reference it
     """
     panel_type_controller.delete(panel_type_id)
     return make_response("PanelType deleted", HTTPStatus.OK)
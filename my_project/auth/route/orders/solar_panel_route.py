@@ -2,7 +2,9 @@ from http import HTTPStatus
 
 from flask import Blueprint, jsonify, Response, request, make_response
 
-from my_project.auth.controller import solar_panel_controller
+from my_project.auth.controller import solar_panel_controller, panel_production_controller
+from my_project.auth.route.responses import (find_all_response, find_by_id_response, create_all_response, mget_response,
+                                             related_response)
 from my_project.auth.domain import SolarPanel
 
 solar_panel_bp = Blueprint('solar_panels', __name__, url_prefix='/solar-panels')
@@ -15,11 +17,49 @@ def get_all_solar_panels() -> Response:
     ---
     tags:
       - SolarPanel
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of panel_type, station
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all solar panels
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering, fields or include
     """
-    return make_response(jsonify(solar_panel_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(solar_panel_controller)
 
 
 @solar_panel_bp.post('')
@@ -60,6 +100,91 @@ def create_solar_panel() -> Response:
     return make_response(jsonify(solar_panel.put_into_dto()), HTTPStatus.CREATED)
 
 
+@solar_panel_bp.post('/bulk')
+def create_solar_panels() -> Response:
+    """
+    Create many solar panels in one transaction
+    ---
+    tags:
+      - SolarPanel
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: solar_panels
+        description: List of solar panel data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              installation_date:
+                type: string
+                format: date
+                description: Installation date
+                example: "2022-01-01"
+              panel_type_id:
+                type: integer
+                description: Panel type ID
+                example: 3
+              station_id:
+                type: integer
+                description: Station ID
+                example: 7
+    responses:
+      201:
+        description: Solar panels created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of solar panels
+    """
+    return create_all_response(solar_panel_controller, SolarPanel)
+
+
+@solar_panel_bp.post('/_mget')
+def get_solar_panels_by_ids() -> Response:
+    """
+    Get many solar panels by ID with one query
+    ---
+    tags:
+      - SolarPanel
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of panel_type, station
+    responses:
+      200:
+        description: Found solar panels in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields or include
+    """
+    return mget_response(solar_panel_controller)
+
+
 @solar_panel_bp.get('/<int:solar_panel_id>')
 def get_solar_panel(solar_panel_id: int) -> Response:
     """
@@ -73,13 +198,27 @@ def get_solar_panel(solar_panel_id: int) -> Response:
         type: integer
         required: true
         description: Solar panel ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of panel_type, station
     responses:
       200:
         description: Solar panel data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Solar panel not found
+      422:
+        description: Unknown field or related object
     """
-    return make_response(jsonify(solar_panel_controller.find_by_id(solar_panel_id)), HTTPStatus.OK)
+    return find_by_id_response(solar_panel_controller, solar_panel_id)
 
 
 @solar_panel_bp.put('/<int:solar_panel_id>')
@@ -165,6 +304,8 @@ def patch_solar_panel(solar_panel_id: int) -> Response:
         description: Solar panel updated successfully
       404:
         description: Solar panel not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     solar_panel_controller.patch(solar_panel_id, content)
@@ -189,6 +330,8 @@ def delete_solar_panel(solar_panel_id: int) -> Response:
         description: Solar panel deleted successfully
       404:
         description: Solar panel not found
+      409:
+        description: Other objects still reference it
     """
     solar_panel_controller.delete(solar_panel_id)
     return make_response("SolarPanel deleted", HTTPStatus.OK)
@@ -207,12 +350,28 @@ def get_solar_panels_after_panel_type(panel_type_id: int) -> Response:
         type: integer
         required: true
         description: Panel type ID
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (at most 1000); the response becomes {items, next}
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor from the previous page's next link
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (panel_type_id, solar_panel_id, panel_type_name, panel_type_description); solar_panel_id is always included
     responses:
       200:
         description: List of solar panels for the specified panel type
+      422:
+        description: Invalid limit, cursor or fields
     """
-    return make_response(jsonify(solar_panel_controller.get_solar_panels_after_panel_type(panel_type_id)),
-                         HTTPStatus.OK)
+    return related_response(solar_panel_controller.get_solar_panels_after_panel_type, panel_type_id)
 
 @solar_panel_bp.get('/get-solar-panels-after-station/<int:station_id>')
 def get_solar_panels_after_station(station_id: int) -> Response:
@@ -227,9 +386,78 @@ def get_solar_panels_after_station(station_id: int) -> Response:
         type: integer
         required: true
         description: Station ID
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (at most 1000); the response becomes {items, next}
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor from the previous page's next link
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (station_id, solar_panel_id, station_total_capacity, station_installation_date, station_location_city, station_location_street); solar_panel_id is always included
     responses:
       200:
         description: List of solar panels for the specified station
+      422:
+        description: Invalid limit, cursor or fields
     """
-    return make_response(jsonify(solar_panel_controller.get_solar_panels_after_station(station_id)), HTTPStatus.OK)
+    return related_response(solar_panel_controller.get_solar_panels_after_station, station_id)
 
+
+@solar_panel_bp.get('/<int:solar_panel_id>/production')
+def get_solar_panel_production(solar_panel_id: int) -> Response:
+    """
+    Get production of a solar panel aggregated into time buckets
+    ---
+    tags:
+      - SolarPanel
+    parameters:
+      - in: path
+        name: solar_panel_id
+        type: integer
+        required: true
+        description: Solar panel ID
+      - in: query
+        name: from
+        type: string
+        format: date-time
+        required: false
+        description: Start of the window, inclusive
+        example: "2023-01-01 00:00:00"
+      - in: query
+        name: to
+        type: string
+        format: date-time
+        required: false
+        description: End of the window, exclusive
+        example: "2023-02-01 00:00:00"
+      - in: query
+        name: bucket
+        type: string
+        enum: [5m, 1h, 1d]
+        required: false
+        default: 1h
+        description: Width of a time bucket
+      - in: query
+        name: agg
+        type: string
+        required: false
+        default: avg
+        description: Comma separated aggregates out of sum, avg, min, max
+        example: "sum,max"
+    responses:
+      200:
+        description: One point per bucket, at most PRODUCTION_MAX_POINTS (truncated is set if the window was cut)
+      422:
+        description: Invalid window, bucket or aggregate
+    """
+    production = panel_production_controller.aggregate_production(
+        solar_panel_id, request.args.get('from'), request.args.get('to'),
+        request.args.get('bucket', '1h'), request.args.get('agg', 'avg'))
+    return make_response(jsonify(production), HTTPStatus.OK)
@@ -3,6 +3,7 @@ from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
 
 from my_project.auth.controller import station_controller
+from my_project.auth.route.responses import find_all_response, find_by_id_response, create_all_response, mget_response
 from my_project.auth.domain import Station
 
 station_bp = Blueprint('stations', __name__, url_prefix='/stations')
@@ -15,11 +16,49 @@ def get_all_stations() -> Response:
     ---
     tags:
       - Station
+    produces:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: ids
+        type: string
+        required: false
+        description: Comma separated IDs to fetch with one query, found ones come back in request order next to the missing IDs
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of location
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size, enables keyset pagination (max 1000)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Opaque cursor of the next page, taken from the "next" link of the previous one
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Stream the whole collection as a chunked JSON array (send Accept application/x-ndjson for NDJSON)
     responses:
       200:
         description: List of all stations
+      304:
+        description: Not modified since the ETag sent in If-None-Match
+      422:
+        description: Invalid ids, limit, cursor, ordering, fields or include
     """
-    return make_response(jsonify(station_controller.find_all()), HTTPStatus.OK)
+    return find_all_response(station_controller)
 
 
 @station_bp.post('')
@@ -61,6 +100,92 @@ def create_station() -> Response:
     return make_response(jsonify(station.put_into_dto()), HTTPStatus.CREATED)
 
 
+@station_bp.post('/bulk')
+def create_stations() -> Response:
+    """
+    Create many stations in one transaction
+    ---
+    tags:
+      - Station
+    parameters:
+      - in: query
+        name: return_ids
+        type: boolean
+        required: false
+        description: Return the generated IDs (slower, rows are flushed one by one)
+      - in: body
+        name: stations
+        description: List of station data
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              total_capacity:
+                type: number
+                format: float
+                description: Total capacity in kW
+                example: 5000.00
+              installation_date:
+                type: string
+                format: date
+                description: Installation date
+                example: "2022-01-15"
+              location_id:
+                type: integer
+                description: Location ID
+                example: 1
+    responses:
+      201:
+        description: Stations created successfully
+      409:
+        description: Some row violates a constraint, nothing was created
+      422:
+        description: Body is not a list of stations
+    """
+    return create_all_response(station_controller, Station)
+
+
+@station_bp.post('/_mget')
+def get_stations_by_ids() -> Response:
+    """
+    Get many stations by ID with one query
+    ---
+    tags:
+      - Station
+    parameters:
+      - in: body
+        name: ids
+        description: IDs to fetch (at most 10000)
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of location
+    responses:
+      200:
+        description: Found stations in request order and the missing IDs
+      422:
+        description: Body has no list of IDs, or invalid fields or include
+    """
+    return mget_response(station_controller)
+
+
 @station_bp.get('/<int:station_id>')
 def get_station(station_id: int) -> Response:
     """
@@ -74,13 +199,27 @@ def get_station(station_id: int) -> Response:
         type: integer
         required: true
         description: Station ID
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated columns to return (id is always included)
+      - in: query
+        name: include
+        type: string
+        required: false
+        description: Comma separated related objects to embed, any of location
     responses:
       200:
         description: Station data
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Station not found
+      422:
+        description: Unknown field or related object
     """
-    return make_response(jsonify(station_controller.find_by_id(station_id)), HTTPStatus.OK)
+    return find_by_id_response(station_controller, station_id)
 
 
 @station_bp.put('/<int:station_id>')
@@ -168,6 +307,8 @@ def patch_station(station_id: int) -> Response:
         description: Station updated successfully
       404:
         description: Station not found
+      422:
+        description: Unknown or primary key field in the body
     """
     content = request.get_json()
     station_controller.patch(station_id, content)
@@ -192,6 +333,8 @@ def delete_station(station_id: int) -> Response:
         description: Station deleted successfully
       404:
         description: Station not found
+      409:
+        description: Other objects still reference it
     """
     station_controller.delete(station_id)
     return make_response("Station deleted", HTTPStatus.OK)
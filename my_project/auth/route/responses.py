@@ -0,0 +1,170 @@
+import hashlib
+from http import HTTPStatus
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from flask import Response, jsonify, make_response, request, url_for, abort, current_app, stream_with_context
+
+from my_project.auth.controller.general_controller import GeneralController
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_CHUNK_ROWS = 500
+
+
+def find_all_response(controller: GeneralController) -> Response:
+    """
+    Builds the response of a `GET ''` route: the whole collection, one keyset page when `limit` is given,
+    or a streamed collection when `stream` is set or NDJSON is accepted, or the rows listed in `ids`.
+    `fields` narrows every DTO, `include` embeds related objects.
+    """
+    return conditional_response(controller, lambda: _find_all_response(controller))
+
+
+def find_by_id_response(controller: GeneralController, key: int) -> Response:
+    """
+    Builds the response of a `GET /<id>` route.
+    """
+    return conditional_response(controller,
+                                lambda: make_response(jsonify(controller.find_by_id(key, list_param('fields'),
+                                                                                    list_param('include'))),
+                                                      HTTPStatus.OK))
+
+
+def conditional_response(controller: GeneralController, build: Callable[[], Response]) -> Response:
+    """
+    Tags a GET response with an ETag derived from the version of the table (and of the tables of the
+    `include` relationships, which are embedded in the body), the URL and the negotiated format,
+    and answers 304 before `build` runs (so without touching the database) when the client has that tag.
+    """
+    version = controller.version(list_param('include'))
+    if version is None:
+        return build()
+    etag = hashlib.blake2b(f"{version}|{request.full_path}|{_wants_ndjson()}".encode(), digest_size=16).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=HTTPStatus.NOT_MODIFIED)
+    else:
+        response = build()
+        if response.status_code != HTTPStatus.OK:
+            return response
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    return response
+
+
+def mget_response(controller: GeneralController) -> Response:
+    """
+    Builds the response of a `POST /_mget` route, for id lists too long for the `ids` query parameter.
+    """
+    content = request.get_json()
+    keys = content.get('ids') if isinstance(content, dict) else None
+    if not isinstance(keys, list) or not all(type(key) is int for key in keys):
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    items = controller.find_by_ids(keys, list_param('fields'), list_param('include'))
+    return make_response(jsonify(items), HTTPStatus.OK)
+
+
+def related_response(find: Callable[..., Tuple[List[Dict[str, object]], Optional[str]]], key: int) -> Response:
+    """
+    Builds the response of a `get-*-after-*` route: every related row, or one keyset page of them
+    (`{"items": [...], "next": url}`) when `limit` is given. `fields` narrows the rows.
+    """
+    limit = request.args.get('limit')
+    if limit is not None and not limit.isdigit():
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    rows, next_cursor = find(key, None if limit is None else int(limit), request.args.get('cursor'),
+                             list_param('fields'))
+    if limit is None:
+        return make_response(jsonify(rows), HTTPStatus.OK)
+    next_link = None
+    if next_cursor is not None:
+        next_link = url_for(request.endpoint, **request.view_args, limit=limit, cursor=next_cursor,
+                            fields=request.args.get('fields'))
+    return make_response(jsonify({'items': rows, 'next': next_link}), HTTPStatus.OK)
+
+
+def _find_all_response(controller: GeneralController) -> Response:
+    limit = request.args.get('limit')
+    fields, include = list_param('fields'), list_param('include')
+    keys = list_param('ids')
+    if keys is not None:
+        if not all(key.isdigit() for key in keys):
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+        return make_response(jsonify(controller.find_by_ids([int(key) for key in keys], fields, include)),
+                             HTTPStatus.OK)
+    if limit is None:
+        if _wants_ndjson():
+            return Response(stream_with_context(_ndjson_lines(controller.iter_all(fields, include))),
+                            mimetype=NDJSON_MIMETYPE)
+        if query_flag('stream'):
+            return Response(stream_with_context(_json_array_chunks(controller.iter_all(fields, include))),
+                            mimetype='application/json')
+        return make_response(jsonify(controller.find_all(fields, include)), HTTPStatus.OK)
+    if not limit.isdigit():
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+
+    order_by = request.args.get('order_by', 'id')
+    items, next_cursor = controller.find_page(int(limit), request.args.get('cursor'), order_by, fields, include)
+    next_link = None
+    if next_cursor is not None:
+        next_link = url_for(request.endpoint, **request.view_args, limit=limit, order_by=order_by, cursor=next_cursor,
+                            fields=request.args.get('fields'), include=request.args.get('include'))
+    return make_response(jsonify({'items': items, 'next': next_link}), HTTPStatus.OK)
+
+
+def create_all_response(controller: GeneralController, domain_type: type) -> Response:
+    """
+    Builds the response of a `POST /bulk` route from a JSON array of DTOs.
+    """
+    content = request.get_json()
+    if not isinstance(content, list) or not all(isinstance(dto, dict) for dto in content):
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    try:
+        obj_list = [domain_type.create_from_dto(dto) for dto in content]
+    except TypeError:
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    return make_response(jsonify(controller.create_all(obj_list, query_flag('return_ids'))), HTTPStatus.CREATED)
+
+
+def query_flag(name: str) -> bool:
+    return request.args.get(name, 'false').lower() in ('1', 'true')
+
+
+def list_param(name: str) -> Optional[List[str]]:
+    """
+    Names in a comma separated query parameter (like `fields`), None when it is absent.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _wants_ndjson() -> bool:
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def _json_array_chunks(dtos: Iterable[Dict[str, object]]) -> Iterator[str]:
+    separator = '['
+    for chunk in _dumped_chunks(dtos):
+        yield separator + ','.join(chunk)
+        separator = ','
+    yield '[]' if separator == '[' else ']'
+
+
+def _ndjson_lines(dtos: Iterable[Dict[str, object]]) -> Iterator[str]:
+    for chunk in _dumped_chunks(dtos):
+        yield '\n'.join(chunk) + '\n'
+
+
+def _dumped_chunks(dtos: Iterable[Dict[str, object]]) -> Iterator[List[str]]:
+    """
+    Groups serialized DTOs so that the WSGI server gets a few large writes instead of one per row.
+    """
+    dumps = current_app.json.dumps
+    chunk = []
+    for dto in dtos:
+        chunk.append(dumps(dto))
+        if len(chunk) == STREAM_CHUNK_ROWS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
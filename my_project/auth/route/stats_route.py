@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+from flask import Blueprint, jsonify, Response, make_response
+
+from my_project import db
+from my_project.auth.dao.cache import entity_cache, procedure_cache
+from my_project.compression import compression_stats
+from my_project.pool import pool_stats
+from my_project.replicas import replica_router
+
+stats_bp = Blueprint('stats', __name__, url_prefix='/stats')
+
+
+@stats_bp.get('/entity-cache')
+def get_entity_cache_stats() -> Response:
+    """
+    Get hit/miss counters of the find-by-id entity cache
+    ---
+    tags:
+      - Stats
+    responses:
+      200:
+        description: Hits, negative ("not found") hits, misses and hit ratio since startup
+    """
+    return make_response(jsonify(entity_cache.stats()), HTTPStatus.OK)
+
+
+@stats_bp.get('/procedure-cache')
+def get_procedure_cache_stats() -> Response:
+    """
+    Get stored procedure result cache statistics
+    ---
+    tags:
+      - Stats
+    responses:
+      200:
+        description: Hits, misses, hit ratio and database time saved by hits since startup
+    """
+    return make_response(jsonify(procedure_cache.stats()), HTTPStatus.OK)
+
+
+@stats_bp.get('/pool')
+def get_pool_stats() -> Response:
+    """
+    Get database connection pool usage
+    ---
+    tags:
+      - Stats
+    responses:
+      200:
+        description: Checkouts, checkout wait times and timeouts since startup, and connections in use now
+    """
+    return make_response(jsonify(pool_stats.as_dict(db.engine)), HTTPStatus.OK)
+
+
+@stats_bp.get('/replicas')
+def get_replica_stats() -> Response:
+    """
+    Get read replica health and routing
+    ---
+    tags:
+      - Stats
+    responses:
+      200:
+        description: Lag, health and routed reads per replica, and reads that fell back to the primary
+    """
+    return make_response(jsonify(replica_router.stats()), HTTPStatus.OK)
+
+
+@stats_bp.get('/compression')
+def get_compression_stats() -> Response:
+    """
+    Get response compression savings and cost
+    ---
+    tags:
+      - Stats
+    responses:
+      200:
+        description: Per encoding, compressed responses, bytes before and after, and CPU time spent compressing
+    """
+    return make_response(jsonify(compression_stats.as_dict()), HTTPStatus.OK)
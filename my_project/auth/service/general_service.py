@@ -1,30 +1,51 @@
 from abc import ABC
-from typing import List
+from typing import List, Dict, Optional, Sequence, Any, Iterator
 
 
 class GeneralService(ABC):
     _dao = None
 
-    def find_all(self) -> List[object]:
-        return self._dao.find_all()
+    def find_all(self, fields: Optional[Sequence[str]] = None, include: Optional[Sequence[str]] = None) -> List[object]:
+        return self._dao.find_all(fields, include)
 
-    def find_by_id(self, key: int) -> object:
-        return self._dao.find_by_id(key)
+    def find_page(self, limit: int, order_by: str = 'id', after: Optional[Sequence[Any]] = None,
+                  fields: Optional[Sequence[str]] = None, include: Optional[Sequence[str]] = None) -> List[object]:
+        return self._dao.find_page(limit, order_by, after, fields, include)
+
+    def iter_all(self, fields: Optional[Sequence[str]] = None, include: Optional[Sequence[str]] = None) -> Iterator[object]:
+        return self._dao.iter_all(fields=fields, include=include)
+
+    def keyset_names(self, order_by: str = 'id') -> List[str]:
+        return self._dao.keyset_names(order_by)
+
+    def find_by_id(self, key: int, include: Optional[Sequence[str]] = None) -> object:
+        return self._dao.find_by_id(key, include)
+
+    def find_by_ids(self, keys: Sequence[int], fields: Optional[Sequence[str]] = None,
+                    include: Optional[Sequence[str]] = None) -> List[object]:
+        return self._dao.find_by_ids(keys, fields, include)
+
+    def find_dto_by_id(self, key: int, fields: Optional[Sequence[str]] = None,
+                       include: Optional[Sequence[str]] = None) -> Optional[Dict[str, object]]:
+        return self._dao.find_dto_by_id(key, fields, include)
+
+    def version(self, include: Optional[Sequence[str]] = None) -> Optional[str]:
+        return self._dao.version(include)
 
     def create(self, obj: object) -> object:
         return self._dao.create(obj)
 
-    def create_all(self, obj_list: List[object]) -> List[object]:
-        return self._dao.create_all(obj_list)
+    def create_all(self, obj_list: List[object], return_ids: bool = False) -> List[int]:
+        return self._dao.create_all(obj_list, return_ids)
 
-    def update(self, key: int, obj: object) -> None:
-        self._dao.update(key, obj)
+    def update(self, key: int, obj: object) -> bool:
+        return self._dao.update(key, obj)
 
-    def patch(self, key: int, field_name: str, value: object) -> None:
-        self._dao.patch(key, field_name, value)
+    def patch(self, key: int, value_dict: Dict[str, object]) -> bool:
+        return self._dao.patch(key, value_dict)
 
-    def delete(self, key: int) -> None:
-        self._dao.delete(key)
+    def delete(self, key: int) -> bool:
+        return self._dao.delete(key)
 
     def delete_all(self) -> None:
         self._dao.delete_all()
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import List, Optional
+
 from my_project.auth.dao import battery_level_dao
 from my_project.auth.service.general_service import GeneralService
 
@@ -5,3 +8,7 @@ from my_project.auth.service.general_service import GeneralService
 class BatteryLevelService(GeneralService):
 
     _dao = battery_level_dao
+
+    def find_levels(self, battery_id: int, date_from: Optional[datetime], date_to: Optional[datetime],
+                    limit: int) -> List[object]:
+        return self._dao.find_levels(battery_id, date_from, date_to, limit)
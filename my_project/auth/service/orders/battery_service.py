@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict, Any, Optional
 
 from my_project.auth.dao import battery_dao
 from my_project.auth.service.general_service import GeneralService
@@ -8,5 +8,7 @@ class BatteryService(GeneralService):
 
     _dao = battery_dao
 
-    def get_batteries_after_station(self, station_id) -> List[object]:
-        return self._dao.get_batteries_after_station(station_id)
+    def get_batteries_after_station(self, station_id: int, limit: Optional[int] = None,
+                                    after: Optional[List[Any]] = None,
+                                    fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return self._dao.get_batteries_after_station(station_id, limit, after, fields)
@@ -10,3 +10,6 @@ class EnergySaleService(GeneralService):
 
     def get_energy_sold(self, type: str) -> List[object]:
         return self._dao.get_energy_sold(type)
+
+    def rebuild_rollups(self) -> int:
+        return self._dao.rebuild_rollups()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from my_project.auth.dao import location_dao
 from my_project.auth.service.general_service import GeneralService
 
@@ -6,5 +8,5 @@ class LocationService(GeneralService):
 
     _dao = location_dao
 
-    def insert_location(self, city: str, street: str):
-        self._dao.insert_location(city, street)
+    def insert_location(self, city: str, street: str) -> Optional[object]:
+        return self._dao.insert_location(city, street)
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import List, Dict, Optional, Sequence
+
 from my_project.auth.dao import panel_production_dao
 from my_project.auth.service.general_service import GeneralService
 
@@ -5,3 +8,7 @@ from my_project.auth.service.general_service import GeneralService
 class PanelProductionService(GeneralService):
 
     _dao = panel_production_dao
+
+    def aggregate_production(self, solar_panel_id: int, date_from: Optional[datetime], date_to: Optional[datetime],
+                             bucket_seconds: int, aggregates: Sequence[str], limit: int) -> List[Dict[str, object]]:
+        return self._dao.aggregate_production(solar_panel_id, date_from, date_to, bucket_seconds, aggregates, limit)
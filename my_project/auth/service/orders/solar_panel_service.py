@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict, Any, Optional
 
 from my_project.auth.dao import solar_panel_dao
 from my_project.auth.service.general_service import GeneralService
@@ -8,8 +8,12 @@ class SolarPanelService(GeneralService):
 
     _dao = solar_panel_dao
 
-    def get_solar_panels_after_panel_type(self, panel_type_id) -> List[object]:
-        return self._dao.get_solar_panels_after_panel_type(panel_type_id)
+    def get_solar_panels_after_panel_type(self, panel_type_id: int, limit: Optional[int] = None,
+                                          after: Optional[List[Any]] = None,
+                                          fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return self._dao.get_solar_panels_after_panel_type(panel_type_id, limit, after, fields)
 
-    def get_solar_panels_after_station(self, station_id) -> List[object]:
-        return self._dao.get_solar_panels_after_station(station_id)
+    def get_solar_panels_after_station(self, station_id: int, limit: Optional[int] = None,
+                                       after: Optional[List[Any]] = None,
+                                       fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return self._dao.get_solar_panels_after_station(station_id, limit, after, fields)
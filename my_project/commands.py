@@ -0,0 +1,45 @@
+import click
+from flask import Flask
+from flask.cli import with_appcontext
+
+
+@click.command('rebuild-energy-rollups')
+@with_appcontext
+def rebuild_energy_rollups() -> None:
+    """
+    Recompute energy_sale_rollup from energy_sale (repair; `migrate` already does the initial backfill).
+    """
+    from my_project.auth.controller import energy_sale_controller
+
+    click.echo(f"Rebuilt {energy_sale_controller.rebuild_rollups()} energy sale rollups")
+
+
+@click.command('migrate')
+@with_appcontext
+def migrate_schema() -> None:
+    """
+    Create the database and tables if needed and bring the schema to the version this code expects.
+    """
+    from flask import current_app
+    from my_project.migrations import migrate
+
+    click.echo(f"Schema is at version {migrate(current_app)}")
+
+
+@click.command('export-apispec')
+@click.argument('path')
+@with_appcontext
+def export_apispec(path: str) -> None:
+    """
+    Write the Swagger spec to PATH, to be served through SWAGGER_SPEC_FILE without parsing docstrings.
+    """
+    from flask import current_app
+    from my_project.api_docs import export_spec
+
+    click.echo(f"Wrote {export_spec(current_app, path)} bytes to {path}")
+
+
+def register_commands(app: Flask) -> None:
+    app.cli.add_command(rebuild_energy_rollups)
+    app.cli.add_command(migrate_schema)
+    app.cli.add_command(export_apispec)
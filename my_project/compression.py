@@ -0,0 +1,140 @@
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator
+
+from flask import Flask, Response, request
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+COMPRESSION_ENABLED = "COMPRESSION_ENABLED"
+COMPRESSION_MIN_SIZE = "COMPRESSION_MIN_SIZE"
+COMPRESSION_GZIP_LEVEL = "COMPRESSION_GZIP_LEVEL"
+COMPRESSION_BROTLI_QUALITY = "COMPRESSION_BROTLI_QUALITY"
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson')
+
+
+class CompressionStats:
+    """
+    Per-encoding totals of compressed responses, bytes before and after, and CPU time spent compressing.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def record(self, encoding: str, raw_bytes: int, sent_bytes: int, cpu_seconds: float) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(encoding, {'responses': 0, 'raw_bytes': 0, 'sent_bytes': 0, 'cpu': 0.0})
+            totals['responses'] += 1
+            totals['raw_bytes'] += raw_bytes
+            totals['sent_bytes'] += sent_bytes
+            totals['cpu'] += cpu_seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                encoding: {
+                    'responses': totals['responses'],
+                    'raw_bytes': totals['raw_bytes'],
+                    'sent_bytes': totals['sent_bytes'],
+                    'ratio': totals['sent_bytes'] / totals['raw_bytes'] if totals['raw_bytes'] else None,
+                    'avg_cpu_ms': 1000 * totals['cpu'] / totals['responses'],
+                    'cpu_ms_per_mb': 1000 * totals['cpu'] / (totals['raw_bytes'] / 2 ** 20) if totals['raw_bytes'] else None,
+                }
+                for encoding, totals in self._totals.items()
+            }
+
+
+compression_stats = CompressionStats()
+
+
+class Compressor:
+    """
+    Incremental gzip or brotli encoder; `compress` output can be sent right away (sync flushed).
+    """
+
+    def __init__(self, encoding: str, level: int) -> None:
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Compresses JSON and NDJSON responses with the best encoding the client accepts: brotli (when
+    the library is installed) or gzip. Buffered responses below COMPRESSION_MIN_SIZE bytes go out as is,
+    streamed ones are always compressed, chunk by chunk.
+    """
+    if not app.config.get(COMPRESSION_ENABLED, True):
+        return
+    min_size = app.config.get(COMPRESSION_MIN_SIZE, 1024)
+    levels = {
+        'gzip': app.config.get(COMPRESSION_GZIP_LEVEL, 6),
+        # brotli's top qualities cost far too much CPU for dynamic responses
+        'br': app.config.get(COMPRESSION_BROTLI_QUALITY, 4),
+    }
+    encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        response.vary.add('Accept-Encoding')
+        if (response.status_code != 200 or request.method == 'HEAD' or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        encoding = request.accept_encodings.best_match(encodings)
+        if encoding is None:
+            return response
+        if not response.is_streamed and response.content_length is not None and response.content_length < min_size:
+            return response
+
+        compressor = Compressor(encoding, levels[encoding])
+        if response.is_streamed:
+            response.response = _compressed_stream(response.iter_encoded(), compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            started = time.thread_time()
+            compressed = compressor.compress(data) + compressor.finish()
+            compression_stats.record(encoding, len(data), len(compressed), time.thread_time() - started)
+            response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        # the bytes differ per encoding, so only a weak validator still holds
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def _compressed_stream(chunks: Iterable[bytes], compressor: Compressor) -> Iterator[bytes]:
+    raw_bytes = sent_bytes = 0
+    cpu = 0.0
+    for chunk in chunks:
+        started = time.thread_time()
+        compressed = compressor.compress(chunk)
+        cpu += time.thread_time() - started
+        raw_bytes += len(chunk)
+        sent_bytes += len(compressed)
+        if compressed:
+            yield compressed
+    started = time.thread_time()
+    tail = compressor.finish()
+    cpu += time.thread_time() - started
+    compression_stats.record(compressor.encoding, raw_bytes, sent_bytes + len(tail), cpu)
+    yield tail
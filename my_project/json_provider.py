@@ -0,0 +1,44 @@
+import json
+from datetime import date
+from typing import Any, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+JSON_PROVIDER = "JSON_PROVIDER"
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """
+    Encodes dates and datetimes as ISO-8601 (the format the API accepts back) instead of Flask's
+    RFC 822 strings, and serializes with orjson when it is installed. Keys stay sorted and
+    everything orjson can't encode natively falls back to the default provider's conversions.
+    """
+
+    use_orjson = orjson is not None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if self.use_orjson:
+            option = orjson.OPT_NON_STR_KEYS
+            if kwargs.get('sort_keys', self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get('indent'):
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=_default, option=option).decode()
+        kwargs.setdefault('default', _default)
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, date):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
@@ -0,0 +1,112 @@
+from typing import Callable, Dict, Optional
+
+from flask import Flask
+from sqlalchemy import Column, Integer, MetaData, Table, inspect, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy_utils import database_exists, create_database
+
+DB_AUTO_MIGRATE = "DB_AUTO_MIGRATE"
+DB_CHECK_SCHEMA = "DB_CHECK_SCHEMA"
+
+SCHEMA_VERSION = 4
+
+# kept out of db.metadata so that it is never part of a create_all and is only written by `migrate`
+schema_version = Table('schema_version', MetaData(), Column('version', Integer, nullable=False))
+
+
+def _create_tables() -> None:
+    from my_project import db
+    import my_project.auth.domain
+
+    db.create_all()
+
+
+def _create_indexes(*names: str) -> Callable[[], None]:
+    """
+    Step that runs CREATE INDEX for the named model indexes the database doesn't have yet:
+    create_all only adds indexes together with a new table, and a fresh database already has them.
+    """
+    def step() -> None:
+        from my_project import db
+        import my_project.auth.domain
+
+        indexes = {index.name: index for table in db.metadata.tables.values() for index in table.indexes}
+        with db.engine.begin() as connection:
+            inspector = inspect(connection)
+            for name in names:
+                index = indexes[name]
+                if name not in {existing['name'] for existing in inspector.get_indexes(index.table.name)}:
+                    index.create(connection)
+
+    return step
+
+
+def _backfill_energy_rollups() -> None:
+    """
+    Fills energy_sale_rollup, which /calculate-energy-sold reads instead of energy_sale, from the existing sales.
+    """
+    from my_project.auth.dao import energy_sale_dao
+
+    energy_sale_dao.rebuild_rollups()
+
+
+# step N brings a database at version N - 1 to version N
+MIGRATIONS: Dict[int, Callable[[], None]] = {
+    1: _create_tables,
+    # keyset pages ordered by date_time
+    2: _create_indexes('ix_battery_level_date_time_id', 'ix_panel_production_date_time_id',
+                       'ix_panel_angle_date_time_id', 'ix_energy_sale_date_time_id'),
+    3: _backfill_energy_rollups,
+    # time windows of one battery / one panel
+    4: _create_indexes('ix_battery_level_battery_id_date_time', 'ix_panel_production_solar_panel_id_date_time'),
+}
+
+
+def current_version() -> Optional[int]:
+    """
+    The schema version recorded in the database, None when it has never been migrated.
+    Any other failure, like an unreachable database, is raised.
+    """
+    from my_project import db
+
+    try:
+        with db.engine.connect() as connection:
+            return connection.execute(select(schema_version.c.version)).scalar()
+    except DBAPIError:
+        # only on the error path, so that the usual start stays at one statement
+        with db.engine.connect() as connection:
+            if inspect(connection).has_table(schema_version.name):
+                raise
+        return None
+
+
+def check_schema(app: Flask) -> None:
+    """
+    Startup check: one SELECT on schema_version. Raises RuntimeError if the database is behind this code.
+    """
+    with app.app_context():
+        version = current_version()
+    if version is None or version < SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema is at version {version}, this code needs {SCHEMA_VERSION}; "
+                           f"run `flask migrate` or start with {DB_AUTO_MIGRATE}=true")
+
+
+def migrate(app: Flask) -> int:
+    """
+    Creates the database if needed and runs the pending migration steps. Returns the resulting version.
+    """
+    from my_project import db
+
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if not database_exists(uri):
+        create_database(uri)
+    with app.app_context():
+        version = current_version() or 0
+        for step in range(version + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[step]()
+        if version < SCHEMA_VERSION:
+            with db.engine.begin() as connection:
+                schema_version.create(connection, checkfirst=True)
+                connection.execute(schema_version.delete())
+                connection.execute(schema_version.insert().values(version=SCHEMA_VERSION))
+    return max(version, SCHEMA_VERSION)
@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Dict, Any, Mapping
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+WAITRESS_THREADS = "WAITRESS_THREADS"
+DB_POOL_SIZE = "DB_POOL_SIZE"
+DB_MAX_OVERFLOW = "DB_MAX_OVERFLOW"
+DB_POOL_TIMEOUT = "DB_POOL_TIMEOUT"
+DB_POOL_RECYCLE = "DB_POOL_RECYCLE"
+DB_POOL_PRE_PING = "DB_POOL_PRE_PING"
+
+DEFAULT_WAITRESS_THREADS = 16
+
+
+class PoolStats:
+    """
+    Connection checkout counters, updated by InstrumentedQueuePool from every waitress thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self, engine: Engine) -> Dict[str, Any]:
+        pool = engine.pool
+        stats: Dict[str, Any] = {
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'avg_wait_ms': 1000 * self.total_wait / self.checkouts if self.checkouts else None,
+            'max_wait_ms': 1000 * self.max_wait,
+        }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'idle': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+            })
+        return stats
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited for a free connection.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            pool_stats.record(time.perf_counter() - started, timed_out)
+
+
+def engine_options(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Pool settings from the app config. By default the pool holds one connection per waitress thread,
+    so requests never queue on checkout, plus a small overflow for CLI and background work.
+    """
+    threads = int(config.get(WAITRESS_THREADS, DEFAULT_WAITRESS_THREADS))
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(config.get(DB_POOL_SIZE) or threads),
+        'max_overflow': int(config.get(DB_MAX_OVERFLOW) or max(threads // 4, 2)),
+        'pool_timeout': float(config.get(DB_POOL_TIMEOUT) or 30),
+        # below MySQL's default wait_timeout (8h) so the server never closes a pooled connection first
+        'pool_recycle': int(config.get(DB_POOL_RECYCLE) or 3600),
+        'pool_pre_ping': bool(config.get(DB_POOL_PRE_PING, True)),
+    }
@@ -0,0 +1,187 @@
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql import Executable
+
+REPLICA_READ = "replica_read"
+WROTE = "wrote"
+REPLICA = "replica"
+PRIMARY_ONLY = "primary_only"
+HEALTH_CHECK_CONNECT_TIMEOUT = 2
+
+
+def replica_read(statement: Executable) -> Executable:
+    """
+    Marks a textual statement (e.g. a read-only CALL) as safe to run on a replica.
+    ORM and Core SELECTs are recognized without it.
+    """
+    return statement.execution_options(**{REPLICA_READ: True})
+
+
+class ReplicaRouter:
+    """
+    Picks a replica engine for reads, round-robin over the replicas that answered the last health check
+    and lag no more than `max_lag` seconds behind the primary. Checks run at most every `check_interval`
+    seconds per replica, inline in the request that finds the previous one expired.
+    """
+
+    def __init__(self) -> None:
+        self.engines: List[Engine] = []
+        self.max_lag: Optional[float] = None
+        self.check_interval = 5.0
+        self._states: Dict[Engine, Dict[str, Any]] = {}
+        self._health_engines: Dict[Engine, Engine] = {}
+        self._cycle = iter(())
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+
+    def configure(self, engines: Sequence[Engine], max_lag: Optional[float] = None,
+                  check_interval: float = 5.0) -> None:
+        for engine in [*self.engines, *self._health_engines.values()]:
+            engine.dispose()
+        self.engines = list(engines)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._states = {engine: {'checked_at': None, 'healthy': False, 'lag': None, 'reads': 0}
+                        for engine in self.engines}
+        self._health_engines = {engine: _health_check_engine(engine) for engine in self.engines}
+        self._cycle = itertools.cycle(self.engines)
+        self.fallbacks = 0
+        for engine in self.engines:
+            event.listen(engine, 'handle_error', self._on_error)
+
+    def engine(self) -> Optional[Engine]:
+        """
+        Returns a healthy replica, or None when there is none and reads must go to the primary.
+        """
+        if not self.engines:
+            return None
+        for _ in range(len(self.engines)):
+            with self._lock:
+                engine = next(self._cycle)
+            state = self._states[engine]
+            if self._healthy(engine, state):
+                state['reads'] += 1
+                return engine
+        self.fallbacks += 1
+        return None
+
+    def mark_down(self, engine: Engine) -> None:
+        """
+        Takes a replica out of rotation until its next health check.
+        """
+        state = self._states.get(engine)
+        if state is not None:
+            state['healthy'], state['checked_at'] = False, time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'max_lag': self.max_lag,
+            'primary_fallbacks': self.fallbacks,
+            'replicas': [
+                {'url': engine.url.render_as_string(hide_password=True),
+                 'healthy': state['healthy'], 'lag': state['lag'], 'reads': state['reads']}
+                for engine, state in self._states.items()
+            ],
+        }
+
+    def _healthy(self, engine: Engine, state: Dict[str, Any]) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            # the first thread to see an expired check runs it, the others keep the previous verdict
+            expired = state['checked_at'] is None or now - state['checked_at'] >= self.check_interval
+            if expired:
+                state['checked_at'] = now
+        if expired:
+            try:
+                state['lag'] = self._lag(self._health_engines[engine])
+                state['healthy'] = state['lag'] is not None and (self.max_lag is None or state['lag'] <= self.max_lag)
+            except Exception:
+                state['lag'], state['healthy'] = None, False
+        return state['healthy']
+
+    @staticmethod
+    def _lag(engine: Engine) -> Optional[float]:
+        """
+        Seconds the replica is behind its source, 0 if it doesn't replicate, None if replication is stopped.
+        """
+        with engine.connect() as connection:
+            if engine.dialect.name != 'mysql':
+                connection.execute(text("SELECT 1"))
+                return 0.0
+            try:
+                status = connection.execute(text("SHOW REPLICA STATUS")).mappings().first()
+            except Exception:
+                status = connection.execute(text("SHOW SLAVE STATUS")).mappings().first()
+        if status is None:
+            return 0.0
+        lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+        return None if lag is None else float(lag)
+
+    def _on_error(self, context) -> None:
+        # a dropped replica is taken out of rotation right away instead of at its next check
+        if context.is_disconnect:
+            self.mark_down(context.engine)
+
+
+replica_router = ReplicaRouter()
+
+
+def _health_check_engine(engine: Engine) -> Engine:
+    # a replica that stopped answering fails its check in seconds instead of holding the request
+    # for the driver's default connect timeout
+    connect_args = {'connect_timeout': HEALTH_CHECK_CONNECT_TIMEOUT} if engine.dialect.name == 'mysql' else {}
+    return create_engine(engine.url, poolclass=NullPool, connect_args=connect_args)
+
+
+class RoutingSession(Session):
+    """
+    Sends SELECTs (and statements marked with replica_read) to a replica. Flushes, writes, locking reads
+    and every read after the session's first write go to the primary, so a request reads its own writes.
+    A read that fails on its replica is retried once on the primary.
+    """
+
+    def execute(self, statement, *args, **kwargs):
+        self.info.pop(REPLICA, None)
+        try:
+            return super().execute(statement, *args, **kwargs)
+        except OperationalError:
+            replica = self.info.pop(REPLICA, None)
+            if replica is None:
+                raise
+        replica_router.mark_down(replica)
+        # the session has not written yet (reads after a write never reach a replica),
+        # so dropping its transaction only discards the broken replica connection
+        self.rollback()
+        self.info[PRIMARY_ONLY] = True
+        try:
+            return super().execute(statement, *args, **kwargs)
+        finally:
+            self.info.pop(PRIMARY_ONLY, None)
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and clause is not None:
+            if not self._flushing and not self.info.get(WROTE) and _is_read(clause):
+                replica = None if self.info.get(PRIMARY_ONLY) else replica_router.engine()
+                if replica is not None:
+                    self.info[REPLICA] = replica
+                    return replica
+            else:
+                self.info[WROTE] = True
+        elif self._flushing:
+            self.info[WROTE] = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _is_read(clause: Any) -> bool:
+    if getattr(clause, 'is_select', False):
+        return getattr(clause, '_for_update_arg', None) is None
+    get_execution_options = getattr(clause, 'get_execution_options', None)
+    return get_execution_options is not None and get_execution_options().get(REPLICA_READ, False)
@@ -0,0 +1,41 @@
+from typing import Any, Iterator, List
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from my_project import db
+from benchmarks.support import make_app, seed_from_data_sql
+
+
+@pytest.fixture
+def app() -> Flask:
+    """
+    The app on an in-memory SQLite database loaded with data.sql.
+    """
+    app = make_app(SWAGGER_ENABLED=False)
+    seed_from_data_sql(app)
+    return app
+
+
+@pytest.fixture
+def client(app: Flask) -> FlaskClient:
+    return app.test_client()
+
+
+@pytest.fixture
+def statements(app: Flask) -> Iterator[List[str]]:
+    """
+    SQL of every statement sent to the database while the test runs.
+    """
+    executed: List[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        executed.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
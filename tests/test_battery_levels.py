@@ -0,0 +1,72 @@
+from typing import Any, List, Tuple
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from my_project import db
+
+INDEX = 'ix_battery_level_battery_id_date_time'
+
+
+def explain(app: Flask, statement: str, parameters: Any) -> str:
+    """
+    The query plan of a statement, as one string naming the indexes it uses.
+    """
+    with app.app_context(), db.engine.connect() as connection:
+        if connection.dialect.name == 'sqlite':
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            return ' | '.join(row[-1] for row in rows)
+        rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+        return ' | '.join(f"{row['table']} type={row['type']} key={row['key']} {row['Extra'] or ''}" for row in rows)
+
+
+def levels_query(app: Flask, client: FlaskClient, url: str) -> Tuple[str, Any]:
+    """
+    Requests `url` and returns the SELECT it ran on battery_level, with its parameters.
+    """
+    executed: List[Tuple[str, Any]] = []
+
+    def record(conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any) -> None:
+        executed.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        assert client.get(url).status_code == 200
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return next((statement, parameters) for statement, parameters in executed if 'FROM battery_level' in statement)
+
+
+@pytest.mark.parametrize('window', ['', 'from=2022-01-01', 'to=2022-02-01', 'from=2022-01-01&to=2022-02-01'])
+def test_window_is_a_range_scan_on_the_battery_time_index(window: str, app: Flask, client: FlaskClient) -> None:
+    plan = explain(app, *levels_query(app, client, f"/batteries/1/levels?{window}&limit=100"))
+
+    assert INDEX in plan, plan
+    with app.app_context():
+        dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        assert plan.startswith('SEARCH') and 'TEMP B-TREE' not in plan, plan
+    else:
+        assert ('type=range' in plan or 'type=ref' in plan) and 'filesort' not in plan, plan
+
+
+@pytest.mark.parametrize('limit', ['abc', '0', '-1', '1.5', '10001'])
+def test_bad_limit_is_422(limit: str, client: FlaskClient) -> None:
+    assert client.get(f"/batteries/1/levels?limit={limit}").status_code == 422
+
+
+def test_window_cut_by_limit_is_truncated(client: FlaskClient) -> None:
+    readings = [{'date_time': f"2022-01-0{day} 10:00:00", 'charge_level': 50.0, 'battery_id': 1} for day in (6, 7, 8)]
+    assert client.post('/battery-levels/bulk', json=readings).status_code == 201
+
+    cut = client.get('/batteries/1/levels?from=2022-01-01&limit=2').get_json()
+    whole = client.get('/batteries/1/levels?from=2022-01-01&limit=4').get_json()
+
+    assert [level['date_time'] for level in cut['levels']] == ['2022-01-05T10:00:00', '2022-01-06T10:00:00']
+    assert cut['truncated'] is True
+    assert len(whole['levels']) == 4
+    assert whole['truncated'] is False
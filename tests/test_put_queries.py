@@ -0,0 +1,48 @@
+from typing import List
+
+import pytest
+from flask.testing import FlaskClient
+
+from my_project import create_app
+
+# EnergySaleDAO locks the old sale first (writing back the same values leaves no rollup delta to upsert)
+PUT_STATEMENTS = {'/energy-sales': 2}
+MISSING_ID = 1000000
+
+
+def put_rules() -> List[str]:
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'DB_CHECK_SCHEMA': False, 'SWAGGER_ENABLED': False})
+    return sorted(rule.rule for rule in app.url_map.iter_rules() if 'PUT' in rule.methods)
+
+
+def put_path(rule: str, key: int) -> str:
+    return rule.replace(rule[rule.index('<'):rule.index('>') + 1], str(key))
+
+
+def collection(rule: str) -> str:
+    return '/' + rule.split('/')[1]
+
+
+@pytest.mark.parametrize('rule', put_rules())
+def test_put_runs_one_update(rule: str, client: FlaskClient, statements: List[str]) -> None:
+    dto = client.get(f"{collection(rule)}/1").get_json()
+    del dto['id']
+    statements.clear()
+
+    response = client.put(put_path(rule, 1), json=dto)
+
+    assert response.status_code == 200
+    assert len(statements) == PUT_STATEMENTS.get(collection(rule), 1), statements
+    assert statements[-1].startswith('UPDATE')
+
+
+@pytest.mark.parametrize('rule', put_rules())
+def test_put_of_missing_row_is_404_without_a_lookup(rule: str, client: FlaskClient, statements: List[str]) -> None:
+    dto = client.get(f"{collection(rule)}/1").get_json()
+    del dto['id']
+    statements.clear()
+
+    response = client.put(put_path(rule, MISSING_ID), json=dto)
+
+    assert response.status_code == 404
+    assert len(statements) == 1, statements